@@ -0,0 +1,43 @@
+"""add_content_version_notify_trigger
+
+Revision ID: 4f2a7c9d1e3b
+Revises: 9cd12c06e418
+Create Date: 2026-10-18 09:12:04.118230
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4f2a7c9d1e3b"
+down_revision: str | Sequence[str] | None = "9cd12c06e418"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_content_version_changed()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            PERFORM pg_notify('content_version_changed', '');
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    op.execute("""
+        CREATE TRIGGER content_versions_notify_changed
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON content_versions
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION notify_content_version_changed()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS content_versions_notify_changed ON content_versions")
+    op.execute("DROP FUNCTION IF EXISTS notify_content_version_changed()")
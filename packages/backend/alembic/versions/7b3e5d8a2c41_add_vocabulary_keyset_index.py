@@ -0,0 +1,28 @@
+"""add_vocabulary_keyset_index
+
+Revision ID: 7b3e5d8a2c41
+Revises: 4f2a7c9d1e3b
+Create Date: 2026-10-18 11:40:27.503918
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7b3e5d8a2c41"
+down_revision: str | Sequence[str] | None = "4f2a7c9d1e3b"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Serves keyset pagination of the admin vocabulary listing, ordered by (list_name, source_text, id).
+    op.execute("CREATE INDEX idx_vocab_version_keyset ON vocabulary_items(version_id, list_name, source_text, id)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS idx_vocab_version_keyset")
@@ -0,0 +1,31 @@
+"""progress_sync_index
+
+Revision ID: a4c7e2f9b5d8
+Revises: f6b1d8e4a0c3
+Create Date: 2026-10-18 19:08:41.227530
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a4c7e2f9b5d8"
+down_revision: str | Sequence[str] | None = "f6b1d8e4a0c3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Adds the tiebreaker column so delta sync can seek to its (last_practiced_at, vocabulary_item_id)
+    # watermark and read rows in cursor order straight from the index.
+    op.execute("DROP INDEX IF EXISTS idx_progress_last_practiced")
+    op.execute("CREATE INDEX idx_progress_last_practiced ON user_progress(user_id, last_practiced_at, vocabulary_item_id)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS idx_progress_last_practiced")
+    op.execute("CREATE INDEX idx_progress_last_practiced ON user_progress(user_id, last_practiced_at)")
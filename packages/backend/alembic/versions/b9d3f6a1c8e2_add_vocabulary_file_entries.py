@@ -0,0 +1,45 @@
+"""add_vocabulary_file_entries
+
+Revision ID: b9d3f6a1c8e2
+Revises: a4c7e2f9b5d8
+Create Date: 2026-10-19 10:14:37.582106
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b9d3f6a1c8e2"
+down_revision: str | Sequence[str] | None = "a4c7e2f9b5d8"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Every entry of every loaded file, so a word listed in several files can be handed to another
+    # file when its owning file drops it or is removed.
+    op.execute("""
+        CREATE TABLE vocabulary_file_entries (
+            version_id INTEGER NOT NULL REFERENCES content_versions(id) ON DELETE CASCADE,
+            source_file TEXT NOT NULL,
+            source_text TEXT NOT NULL,
+            source_language VARCHAR(10) NOT NULL,
+            target_text TEXT NOT NULL,
+            target_language VARCHAR(10) NOT NULL,
+            list_name TEXT NOT NULL,
+            source_usage_example TEXT,
+            target_usage_example TEXT,
+            PRIMARY KEY (version_id, source_file, source_text, source_language, target_language)
+        )
+    """)
+    op.execute("CREATE INDEX idx_vocab_file_entries_key ON vocabulary_file_entries(version_id, source_text, source_language, target_language)")
+    # Make the next load re-merge every file so the table gets populated.
+    op.execute("DELETE FROM vocabulary_load_ledger")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE IF EXISTS vocabulary_file_entries")
@@ -0,0 +1,42 @@
+"""add_vocabulary_load_ledger
+
+Revision ID: c81d4f6e9a27
+Revises: 7b3e5d8a2c41
+Create Date: 2026-10-18 13:05:51.274406
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c81d4f6e9a27"
+down_revision: str | Sequence[str] | None = "7b3e5d8a2c41"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # File a row was last loaded from; NULL for rows created through the admin API.
+    op.execute("ALTER TABLE vocabulary_items ADD COLUMN source_file TEXT")
+    op.execute("CREATE INDEX idx_vocab_source_file ON vocabulary_items(version_id, source_file) WHERE is_active")
+
+    op.execute("""
+        CREATE TABLE vocabulary_load_ledger (
+            version_id INTEGER NOT NULL REFERENCES content_versions(id) ON DELETE CASCADE,
+            file_name TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            row_count INTEGER NOT NULL,
+            loaded_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (version_id, file_name)
+        )
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE IF EXISTS vocabulary_load_ledger")
+    op.execute("DROP INDEX IF EXISTS idx_vocab_source_file")
+    op.execute("ALTER TABLE vocabulary_items DROP COLUMN IF EXISTS source_file")
@@ -0,0 +1,87 @@
+"""backfill_vocabulary_source_file
+
+Revision ID: d2e8a5c3f7b1
+Revises: b9d3f6a1c8e2
+Create Date: 2026-10-19 11:02:18.904417
+
+"""
+
+from collections.abc import Sequence
+import json
+from pathlib import Path
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "d2e8a5c3f7b1"
+down_revision: str | Sequence[str] | None = "b9d3f6a1c8e2"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+VOCAB_DIR = Path(__file__).resolve().parents[2] / "migrations" / "data" / "vocabulary"
+
+# Words created through the admin API have an ADD changelog entry by an admin; the loader only
+# started writing changelog entries (as 'load_vocabulary') together with source_file.
+ADMIN_CREATED = """EXISTS (
+    SELECT 1 FROM content_changelog cl
+    WHERE cl.vocabulary_item_id = vocabulary_items.id
+      AND cl.change_type = 'ADD'
+      AND cl.changed_by IS DISTINCT FROM 'load_vocabulary'
+)"""
+
+# Only keys the loader can actually account for are handed to it: those listed in a vocabulary
+# file or already recorded in vocabulary_file_entries. Older admin words have no changelog entry
+# at all, so ADMIN_CREATED alone cannot tell them apart from loaded ones.
+LISTED_IN_FILES = """(
+    EXISTS (
+        SELECT 1 FROM jsonb_to_recordset(CAST(:file_keys AS jsonb))
+            AS k(source_text TEXT, source_language TEXT, target_language TEXT)
+        WHERE k.source_text = vocabulary_items.source_text
+          AND k.source_language = vocabulary_items.source_language
+          AND k.target_language = vocabulary_items.target_language
+    )
+    OR EXISTS (
+        SELECT 1 FROM vocabulary_file_entries fe
+        WHERE fe.version_id = vocabulary_items.version_id
+          AND fe.source_text = vocabulary_items.source_text
+          AND fe.source_language = vocabulary_items.source_language
+          AND fe.target_language = vocabulary_items.target_language
+    )
+)"""
+
+
+def _file_keys() -> list[dict]:
+    keys = []
+    for json_file in sorted(VOCAB_DIR.glob("*.json")):
+        data = json.loads(json_file.read_bytes())
+        for item in data.get("translations", []):
+            if item.get("source_word") and item.get("target_word"):
+                keys.append(
+                    {
+                        "source_text": item["source_word"],
+                        "source_language": data.get("source_language"),
+                        "target_language": data.get("target_language"),
+                    }
+                )
+    return keys
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Admin-created words the loader claimed because their key also appears in a file.
+    op.execute(f"UPDATE vocabulary_items SET source_file = NULL WHERE source_file IS NOT NULL AND {ADMIN_CREATED}")
+    # Words loaded before source_file existed. The empty placeholder marks them as loader-owned;
+    # the loader's reconcile pass replaces it with the file that lists the word, or deactivates it.
+    # Any other NULL row stays NULL and is left to the admins.
+    op.execute(
+        sa.text(f"UPDATE vocabulary_items SET source_file = '' WHERE source_file IS NULL AND NOT {ADMIN_CREATED} AND {LISTED_IN_FILES}").bindparams(
+            file_keys=json.dumps(_file_keys())
+        )
+    )
+    op.execute("DELETE FROM vocabulary_load_ledger")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("UPDATE vocabulary_items SET source_file = NULL WHERE source_file = ''")
@@ -0,0 +1,43 @@
+"""add_users_notify_trigger
+
+Revision ID: e3a9c5b7d2f1
+Revises: c81d4f6e9a27
+Create Date: 2026-10-18 15:42:19.603117
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e3a9c5b7d2f1"
+down_revision: str | Sequence[str] | None = "c81d4f6e9a27"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_user_changed()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            PERFORM pg_notify('user_changed', OLD.id::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    op.execute("""
+        CREATE TRIGGER users_notify_changed
+            AFTER UPDATE OF username, is_admin OR DELETE ON users
+            FOR EACH ROW
+            EXECUTE FUNCTION notify_user_changed()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS users_notify_changed ON users")
+    op.execute("DROP FUNCTION IF EXISTS notify_user_changed()")
@@ -0,0 +1,136 @@
+"""Benchmark: per-request overhead of the header/metrics middleware, BaseHTTPMiddleware vs pure ASGI.
+
+Builds two otherwise identical apps serving /api/health and /api/version (the health route answers
+without a database so only framework overhead is measured):
+
+- before: the security-header and metrics middleware as @app.middleware("http") functions
+- after: core.middleware.SecurityHeadersMiddleware and RequestMetricsMiddleware
+
+Each app is driven in-process through httpx's ASGI transport, sequentially for latency and with
+concurrent clients for throughput.
+
+Run from packages/backend:
+    python benchmarks/middleware_overhead.py [--requests 5000] [--concurrency 50]
+"""
+
+import argparse
+import asyncio
+import datetime as dt
+from pathlib import Path
+import statistics
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from core.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_PROGRESS
+from core.middleware import NO_STORE_HEADERS, SECURITY_HEADERS, RequestMetricsMiddleware, SecurityHeadersMiddleware
+from fastapi import FastAPI, Request
+import httpx
+from schemas.health import HealthResponse, VersionResponse
+
+ENDPOINTS = ("/api/health", "/api/version")
+
+
+def add_routes(app: FastAPI):
+    @app.get("/api/health", response_model=HealthResponse)
+    async def health_check():
+        return HealthResponse(status="ok", database="connected", timestamp=dt.datetime.now(dt.UTC).isoformat())
+
+    @app.get("/api/version", response_model=VersionResponse)
+    async def get_version():
+        return VersionResponse(version="4.0.0")
+
+
+def build_base_http_app() -> FastAPI:
+    """The middleware as main.py used to define it."""
+    app = FastAPI()
+
+    @app.middleware("http")
+    async def record_request_metrics(request: Request, call_next):
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(request.method)
+        in_progress.inc()
+        started = time.perf_counter()
+        status_code = 500
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        finally:
+            route = request.scope.get("route")
+            route_path = route.path if route is not None else "unmatched"
+            HTTP_REQUEST_DURATION.labels(request.method, route_path, str(status_code)).observe(time.perf_counter() - started)
+            in_progress.dec()
+
+    @app.middleware("http")
+    async def add_security_headers(request: Request, call_next):
+        response = await call_next(request)
+        for name, value in SECURITY_HEADERS.items():
+            response.headers[name] = value
+        if request.url.path.startswith("/api/") and "cache-control" not in response.headers:
+            for name, value in NO_STORE_HEADERS.items():
+                response.headers[name] = value
+        return response
+
+    add_routes(app)
+    return app
+
+
+def build_pure_asgi_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestMetricsMiddleware)
+    app.add_middleware(SecurityHeadersMiddleware)
+    add_routes(app)
+    return app
+
+
+async def measure(app: FastAPI, path: str, requests: int, concurrency: int) -> tuple[float, float]:
+    """Returns (median latency in ms for sequential requests, requests/s with concurrent clients)."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(200):
+            (await client.get(path)).raise_for_status()
+
+        latencies = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            await client.get(path)
+            latencies.append(time.perf_counter() - started)
+
+        per_worker = requests // concurrency
+
+        async def worker():
+            for _ in range(per_worker):
+                await client.get(path)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        throughput = per_worker * concurrency / (time.perf_counter() - started)
+
+    return statistics.median(latencies) * 1000, throughput
+
+
+async def run(requests: int, concurrency: int):
+    apps = {"BaseHTTPMiddleware": build_base_http_app(), "pure ASGI": build_pure_asgi_app()}
+
+    for path in ENDPOINTS:
+        print(f"{path} ({requests} requests, {concurrency} concurrent clients for throughput)")
+        results = {}
+        for name, app in apps.items():
+            results[name] = await measure(app, path, requests, concurrency)
+            latency, throughput = results[name]
+            print(f"  {name:<20} median latency {latency:6.3f} ms   throughput {throughput:8.0f} req/s")
+        before, after = results["BaseHTTPMiddleware"], results["pure ASGI"]
+        print(f"  latency -{(1 - after[0] / before[0]) * 100:.0f}%, throughput +{(after[1] / before[1] - 1) * 100:.0f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
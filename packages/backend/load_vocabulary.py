@@ -1,17 +1,38 @@
 #!/usr/bin/env python3
 """
 Vocabulary data loader for Alembic-migrated database.
-Loads vocabulary JSON files into vocabulary_items table.
+Synchronizes vocabulary JSON files into the vocabulary_items table.
+
+Each file is streamed with COPY into a temporary staging table and merged in one
+statement: new words are inserted, changed ones updated and words previously loaded
+from the file but no longer in it deactivated (rows remember their file in
+vocabulary_items.source_file, so admin-created words are never touched). A per-file
+content hash is kept in vocabulary_load_ledger so files that have not changed since
+the last run are skipped without being parsed.
+
+Every file's entries are also kept in vocabulary_file_entries. A word listed in several
+files belongs to the file sorting first; when that file drops the word or is removed, a
+final reconcile pass hands the word to the next file still listing it instead of
+deactivating it.
+
+Files are hashed and parsed in a process pool and merged concurrently over a small
+connection pool, one transaction per file.
 """
 
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+import hashlib
+import io
 import json
 import logging
 import os
 from pathlib import Path
 import sys
+import time
 
 import psycopg2
-from psycopg2.extras import execute_values
+from psycopg2 import errors, pool
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
@@ -24,6 +45,177 @@ db_config = {
     "password": os.getenv("POSTGRES_PASSWORD", "password"),
 }
 
+VOCAB_DIR = Path("./migrations/data/vocabulary")
+CHANGED_BY = "load_vocabulary"
+DEFAULT_WORKERS = int(os.getenv("VOCAB_LOAD_WORKERS", "4"))
+MERGE_ATTEMPTS = 3
+
+STAGING_COLUMNS = (
+    "source_text",
+    "source_language",
+    "target_text",
+    "target_language",
+    "list_name",
+    "source_usage_example",
+    "target_usage_example",
+)
+
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+# Replaces this file's entries in vocabulary_file_entries with the staged rows.
+FILE_ENTRIES_SQL = f"""
+DELETE FROM vocabulary_file_entries WHERE version_id = %(version_id)s AND source_file = %(file_name)s;
+INSERT INTO vocabulary_file_entries (version_id, source_file, {", ".join(STAGING_COLUMNS)})
+SELECT %(version_id)s, %(file_name)s, {", ".join(STAGING_COLUMNS)} FROM vocab_staging;
+"""
+
+# Upserts the staged rows, touching only rows whose content actually differs and never rows
+# created through the admin API (NULL source_file), even when a file lists the same word. A
+# word listed in several files is owned by the file whose name sorts first under COLLATE "C",
+# no matter which merge commits first. Then deactivates rows loaded from this file that are
+# no longer in it and that no other file lists (those are handed over by RECONCILE_SQL), and
+# records every change in content_changelog so cached API responses are revalidated.
+MERGE_SQL = """
+WITH upserted AS (
+    INSERT INTO vocabulary_items
+        (version_id, source_text, source_language, target_text, target_language,
+         list_name, source_usage_example, target_usage_example, source_file)
+    SELECT %(version_id)s, source_text, source_language, target_text, target_language,
+           list_name, source_usage_example, target_usage_example, %(file_name)s
+    FROM vocab_staging
+    ORDER BY source_text, source_language, target_language
+    ON CONFLICT (version_id, source_text, source_language, target_language) DO UPDATE SET
+        target_text = EXCLUDED.target_text,
+        list_name = EXCLUDED.list_name,
+        source_usage_example = EXCLUDED.source_usage_example,
+        target_usage_example = EXCLUDED.target_usage_example,
+        source_file = EXCLUDED.source_file,
+        is_active = TRUE
+    WHERE vocabulary_items.source_file IS NOT NULL
+      AND (vocabulary_items.source_file = EXCLUDED.source_file
+           OR NOT vocabulary_items.is_active
+           OR EXCLUDED.source_file < vocabulary_items.source_file COLLATE "C")
+      AND (vocabulary_items.target_text, vocabulary_items.list_name, vocabulary_items.source_usage_example,
+           vocabulary_items.target_usage_example, vocabulary_items.source_file, vocabulary_items.is_active)
+          IS DISTINCT FROM
+          (EXCLUDED.target_text, EXCLUDED.list_name, EXCLUDED.source_usage_example,
+           EXCLUDED.target_usage_example, EXCLUDED.source_file, TRUE)
+    RETURNING id, (xmax = 0) AS inserted, source_text, target_text, list_name
+),
+deactivated AS (
+    UPDATE vocabulary_items vi
+    SET is_active = FALSE
+    WHERE vi.version_id = %(version_id)s
+      AND vi.source_file = %(file_name)s
+      AND vi.is_active
+      AND NOT EXISTS (
+          SELECT 1 FROM vocab_staging s
+          WHERE s.source_text = vi.source_text
+            AND s.source_language = vi.source_language
+            AND s.target_language = vi.target_language
+      )
+      AND NOT EXISTS (
+          SELECT 1 FROM vocabulary_file_entries e
+          WHERE e.version_id = vi.version_id
+            AND e.source_file <> %(file_name)s
+            AND e.source_text = vi.source_text
+            AND e.source_language = vi.source_language
+            AND e.target_language = vi.target_language
+      )
+    RETURNING vi.id, vi.source_text, vi.target_text, vi.list_name
+),
+changelog AS (
+    INSERT INTO content_changelog (version_id, change_type, vocabulary_item_id, old_values, new_values, changed_by)
+    SELECT %(version_id)s, CASE WHEN inserted THEN 'ADD' ELSE 'UPDATE' END, id, NULL,
+           jsonb_build_object('source_text', source_text, 'target_text', target_text, 'list_name', list_name),
+           %(changed_by)s
+    FROM upserted
+    UNION ALL
+    SELECT %(version_id)s, 'DELETE', id,
+           jsonb_build_object('source_text', source_text, 'target_text', target_text, 'list_name', list_name),
+           NULL, %(changed_by)s
+    FROM deactivated
+)
+SELECT (SELECT COUNT(*) FROM upserted WHERE inserted) AS inserted,
+       (SELECT COUNT(*) FROM upserted WHERE NOT inserted) AS updated,
+       (SELECT COUNT(*) FROM deactivated) AS deactivated
+"""
+
+# Runs once after every file is merged. Gives each loaded word the content of the first file
+# (COLLATE "C") that still lists it, handing it over when its owner dropped it or was removed,
+# and deactivates loaded words no file lists any more. Concurrent merges can each see a stale
+# view of the others; this pass sees them all.
+RECONCILE_SQL = """
+WITH desired AS (
+    SELECT DISTINCT ON (source_text, source_language, target_language) *
+    FROM vocabulary_file_entries
+    WHERE version_id = %(version_id)s
+    ORDER BY source_text, source_language, target_language, source_file COLLATE "C"
+),
+reassigned AS (
+    UPDATE vocabulary_items vi
+    SET target_text = d.target_text,
+        list_name = d.list_name,
+        source_usage_example = d.source_usage_example,
+        target_usage_example = d.target_usage_example,
+        source_file = d.source_file,
+        is_active = TRUE
+    FROM desired d
+    WHERE vi.version_id = %(version_id)s
+      AND vi.source_file IS NOT NULL
+      AND vi.source_text = d.source_text
+      AND vi.source_language = d.source_language
+      AND vi.target_language = d.target_language
+      AND (vi.target_text, vi.list_name, vi.source_usage_example, vi.target_usage_example, vi.source_file, vi.is_active)
+          IS DISTINCT FROM
+          (d.target_text, d.list_name, d.source_usage_example, d.target_usage_example, d.source_file, TRUE)
+    RETURNING vi.id, vi.source_text, vi.target_text, vi.list_name
+),
+orphaned AS (
+    UPDATE vocabulary_items vi
+    SET is_active = FALSE
+    WHERE vi.version_id = %(version_id)s
+      AND vi.source_file IS NOT NULL
+      AND vi.is_active
+      AND NOT EXISTS (
+          SELECT 1 FROM vocabulary_file_entries e
+          WHERE e.version_id = vi.version_id
+            AND e.source_text = vi.source_text
+            AND e.source_language = vi.source_language
+            AND e.target_language = vi.target_language
+      )
+    RETURNING vi.id, vi.source_text, vi.target_text, vi.list_name
+),
+changelog AS (
+    INSERT INTO content_changelog (version_id, change_type, vocabulary_item_id, old_values, new_values, changed_by)
+    SELECT %(version_id)s, 'UPDATE', id, NULL,
+           jsonb_build_object('source_text', source_text, 'target_text', target_text, 'list_name', list_name),
+           %(changed_by)s
+    FROM reassigned
+    UNION ALL
+    SELECT %(version_id)s, 'DELETE', id,
+           jsonb_build_object('source_text', source_text, 'target_text', target_text, 'list_name', list_name),
+           NULL, %(changed_by)s
+    FROM orphaned
+)
+SELECT (SELECT COUNT(*) FROM reassigned) AS reassigned,
+       (SELECT COUNT(*) FROM orphaned) AS deactivated
+"""
+
+
+@dataclass
+class FileResult:
+    file_name: str
+    rows: int
+    inserted: int
+    updated: int
+    deactivated: int
+    seconds: float
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
 
 def get_active_version_id(conn):
     with conn.cursor() as cur:
@@ -44,52 +236,193 @@ def get_active_version_id(conn):
         return result[0] if result else None
 
 
-def load_json_file(json_file, version_id, conn):
-    with open(json_file) as f:
-        data = json.load(f)
+def get_loaded_hashes(conn, version_id):
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT file_name, content_hash FROM vocabulary_load_ledger WHERE version_id = %s",
+            (version_id,),
+        )
+        return dict(cur.fetchall())
+
+
+def parse_vocabulary_file(raw: bytes, file_name: str):
+    """Return one staging record per unique translation key; the first entry wins."""
+    data = json.loads(raw)
 
     source_language = data.get("source_language")
     target_language = data.get("target_language")
     word_list_name = data.get("word_list_name")
-    translations = data.get("translations", [])
-
-    if not translations:
-        logger.warning(f"No translations found in {json_file.name}")
-        return 0, 0
-
-    records = [
-        (
-            version_id,
-            item.get("source_word"),
-            source_language,
-            item.get("target_word"),
-            target_language,
-            word_list_name,
-            None,
-            item.get("source_example"),
-            item.get("target_example"),
+
+    records = {}
+    incomplete = 0
+    for item in data.get("translations", []):
+        source_text = item.get("source_word")
+        target_text = item.get("target_word")
+        if not source_text or not target_text:
+            incomplete += 1
+            continue
+        records.setdefault(
+            source_text,
+            (
+                source_text,
+                source_language,
+                target_text,
+                target_language,
+                word_list_name,
+                item.get("source_example"),
+                item.get("target_example"),
+            ),
+        )
+
+    if incomplete:
+        logger.warning(f"{file_name}: skipped {incomplete} entries without source or target word")
+
+    return list(records.values())
+
+
+def _copy_value(value):
+    return "\\N" if value is None else str(value).translate(_COPY_ESCAPES)
+
+
+def copy_to_staging(cur, records):
+    cur.execute(f"CREATE TEMP TABLE vocab_staging ({', '.join(f'{column} TEXT' for column in STAGING_COLUMNS)}) ON COMMIT DROP")
+    payload = "".join("\t".join(_copy_value(value) for value in record) + "\n" for record in records)
+    cur.copy_expert(f"COPY vocab_staging ({', '.join(STAGING_COLUMNS)}) FROM STDIN", io.StringIO(payload))
+    cur.execute("ANALYZE vocab_staging")
+
+
+def merge_vocabulary_file(conn, version_id, file_name, content_hash, records):
+    with conn.cursor() as cur:
+        copy_to_staging(cur, records)
+        cur.execute(FILE_ENTRIES_SQL, {"version_id": version_id, "file_name": file_name})
+        cur.execute(
+            MERGE_SQL,
+            {"version_id": version_id, "file_name": file_name, "changed_by": CHANGED_BY},
         )
-        for item in translations
-    ]
+        inserted, updated, deactivated = cur.fetchone()
+        cur.execute(
+            """INSERT INTO vocabulary_load_ledger (version_id, file_name, content_hash, row_count)
+               VALUES (%s, %s, %s, %s)
+               ON CONFLICT (version_id, file_name) DO UPDATE SET
+                   content_hash = EXCLUDED.content_hash,
+                   row_count = EXCLUDED.row_count,
+                   loaded_at = NOW()""",
+            (version_id, file_name, content_hash, len(records)),
+        )
+    conn.commit()
+    return inserted, updated, deactivated
+
+
+def read_vocabulary_file(json_file, loaded_hash):
+    """Process-pool worker: hash and parse one file. Records are None when the ledger hash matches."""
+    raw = json_file.read_bytes()
+    content_hash = hashlib.sha256(raw).hexdigest()
+    if loaded_hash == content_hash:
+        return content_hash, None
+    return content_hash, parse_vocabulary_file(raw, json_file.name)
+
+
+def merge_with_retry(db_pool, version_id, file_name, content_hash, records):
+    """Merge one file on a pooled connection, retrying if it deadlocks with a concurrent merge."""
+    conn = db_pool.getconn()
+    try:
+        for attempt in range(1, MERGE_ATTEMPTS + 1):
+            started = time.perf_counter()
+            try:
+                counts = merge_vocabulary_file(conn, version_id, file_name, content_hash, records)
+                return FileResult(file_name, len(records), *counts, time.perf_counter() - started)
+            except (errors.DeadlockDetected, errors.SerializationFailure) as e:
+                conn.rollback()
+                if attempt == MERGE_ATTEMPTS:
+                    raise
+                logger.warning(f"{file_name}: {e.__class__.__name__}, retrying ({attempt}/{MERGE_ATTEMPTS})")
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        db_pool.putconn(conn)
 
+
+def forget_removed_files(conn, version_id, file_names):
+    """Drop the ledger rows and entries of files that were loaded before but no longer exist.
+
+    Their words are handed over or deactivated by reconcile_vocabulary.
+    """
     with conn.cursor() as cur:
-        execute_values(
-            cur,
-            """INSERT INTO vocabulary_items
-               (version_id, source_text, source_language, target_text, target_language,
-                list_name, difficulty_level, source_usage_example, target_usage_example)
-               VALUES %s
-               ON CONFLICT (version_id, source_text, source_language, target_language) DO NOTHING""",
-            records,
+        cur.execute(
+            """WITH removed AS (
+                   DELETE FROM vocabulary_load_ledger
+                   WHERE version_id = %(version_id)s AND NOT (file_name = ANY(%(file_names)s))
+                   RETURNING file_name
+               ),
+               entries AS (
+                   DELETE FROM vocabulary_file_entries
+                   WHERE version_id = %(version_id)s AND NOT (source_file = ANY(%(file_names)s))
+               )
+               SELECT COUNT(*) FROM removed""",
+            {"version_id": version_id, "file_names": file_names},
         )
+        removed_files = cur.fetchone()[0]
+    conn.commit()
+    return removed_files
+
 
-        inserted = cur.rowcount
-        skipped = len(records) - inserted
-        conn.commit()
-        return inserted, skipped
+def reconcile_vocabulary(conn, version_id):
+    with conn.cursor() as cur:
+        cur.execute(RECONCILE_SQL, {"version_id": version_id, "changed_by": CHANGED_BY})
+        reassigned, deactivated = cur.fetchone()
+    conn.commit()
+    return reassigned, deactivated
+
+
+def ingest_files(version_id, json_files, loaded_hashes, workers):
+    """Hash and parse files in a process pool and merge each changed one as soon as it is parsed."""
+    results = []
+    unchanged = 0
+    failed = 0
+    db_pool = pool.ThreadedConnectionPool(1, workers, **db_config)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as parsers, ThreadPoolExecutor(max_workers=workers) as mergers:
+            parsing = {parsers.submit(read_vocabulary_file, f, loaded_hashes.get(f.name)): f for f in json_files}
+            merging = {}
+            for future in as_completed(parsing):
+                json_file = parsing[future]
+                try:
+                    content_hash, records = future.result()
+                except Exception as e:
+                    logger.error(f"Error parsing {json_file.name}: {e}")
+                    failed += 1
+                    continue
+
+                if records is None:
+                    unchanged += 1
+                    logger.info(f"✓ {json_file.name}: unchanged, skipped")
+                elif not records:
+                    logger.warning(f"No translations found in {json_file.name}")
+                else:
+                    merging[mergers.submit(merge_with_retry, db_pool, version_id, json_file.name, content_hash, records)] = json_file
+
+            for future in as_completed(merging):
+                json_file = merging[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"Error loading {json_file.name}: {e}")
+                    failed += 1
+                    continue
+
+                results.append(result)
+                logger.info(
+                    f"✓ {result.file_name}: {result.inserted} inserted, {result.updated} updated, "
+                    f"{result.deactivated} deactivated ({result.rows} rows in {result.seconds:.2f}s, {result.rows_per_second:,.0f} rows/s)"
+                )
+    finally:
+        db_pool.closeall()
+
+    return results, unchanged, failed
 
 
-def load_vocabulary():
+def load_vocabulary(force=False, workers=DEFAULT_WORKERS):
     try:
         conn = psycopg2.connect(**db_config)
         logger.info("Connected to database successfully")
@@ -101,32 +434,45 @@ def load_vocabulary():
 
         logger.info(f"Using active version ID: {version_id}")
 
-        vocab_dir = Path("./migrations/data/vocabulary")
-        if not vocab_dir.exists():
-            logger.warning(f"Vocabulary directory not found: {vocab_dir}")
+        if not VOCAB_DIR.exists():
+            logger.warning(f"Vocabulary directory not found: {VOCAB_DIR}")
             logger.info("Skipping vocabulary loading (no data to load)")
             return
 
-        json_files = sorted(vocab_dir.glob("*.json"))
+        json_files = sorted(VOCAB_DIR.glob("*.json"))
         if not json_files:
             logger.warning("No JSON files found in vocabulary directory")
             return
 
-        total_inserted = 0
-        total_skipped = 0
+        loaded_hashes = {} if force else get_loaded_hashes(conn, version_id)
+        workers = max(1, min(workers, len(json_files)))
+        logger.info(f"Loading {len(json_files)} file(s) with {workers} worker(s)")
 
-        for json_file in json_files:
-            try:
-                inserted, skipped = load_json_file(json_file, version_id, conn)
-                total_inserted += inserted
-                total_skipped += skipped
-                logger.info(f"✓ {json_file.name}: {inserted} inserted, {skipped} skipped")
-            except Exception as e:
-                logger.error(f"Error loading {json_file.name}: {e}")
-                conn.rollback()
-                continue
+        started = time.perf_counter()
+        results, unchanged, failed = ingest_files(version_id, json_files, loaded_hashes, workers)
 
-        logger.info(f"\n✓ Total: {total_inserted} inserted, {total_skipped} skipped")
+        removed_files = forget_removed_files(conn, version_id, [f.name for f in json_files])
+        if removed_files:
+            logger.info(f"✓ {removed_files} removed file(s)")
+
+        # A file that failed to merge has stale entries; reconciling against them could deactivate
+        # its words, so wait for a clean run.
+        reassigned = removed_deactivated = 0
+        if failed:
+            logger.warning("Skipping reconcile because some files failed to load")
+        else:
+            reassigned, removed_deactivated = reconcile_vocabulary(conn, version_id)
+            if reassigned or removed_deactivated:
+                logger.info(f"✓ Reconciled shared words: {reassigned} handed over, {removed_deactivated} deactivated")
+
+        elapsed = time.perf_counter() - started
+        total_rows = sum(r.rows for r in results)
+        logger.info(
+            f"\n✓ Total: {sum(r.inserted for r in results)} inserted, {sum(r.updated for r in results) + reassigned} updated, "
+            f"{sum(r.deactivated for r in results) + removed_deactivated} deactivated; "
+            f"{len(results)} file(s) merged, {unchanged} unchanged, {failed} failed; "
+            f"{total_rows} rows in {elapsed:.2f}s ({total_rows / elapsed if elapsed > 0 else 0:,.0f} rows/s)"
+        )
 
     except psycopg2.Error as e:
         logger.error(f"Database error: {e}")
@@ -141,4 +487,8 @@ def load_vocabulary():
 
 
 if __name__ == "__main__":
-    load_vocabulary()
+    parser = argparse.ArgumentParser(description="Synchronize vocabulary JSON files into the database")
+    parser.add_argument("--force", action="store_true", help="merge every file even if its content hash is unchanged")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="parallel parse processes and database connections")
+    args = parser.parse_args()
+    load_vocabulary(force=args.force, workers=args.workers)
@@ -1,10 +1,17 @@
 import logging
+from uuid import UUID
 
-from core.database import execute_write_transaction, query_db
+from core.content_version import get_active_version_id
+from core.database import async_estimate_count, async_execute_write_transaction, async_query_db, get_async_transaction
 from core.security import require_admin
+from core.vocabulary_search import search_vocabulary_items
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
+from psycopg.types.json import Jsonb
 from pydantic import BaseModel, Field
-from utils import convert_keys_to_camel_case
+from schemas.tts import TTSCacheStatsResponse
+from tts_service import TTSService, get_tts_service
+from utils import convert_keys_to_camel_case, decode_cursor, encode_cursor
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
@@ -53,32 +60,44 @@ class VocabularyItemDetailResponse(BaseModel):
         populate_by_name = True
 
 
+class VocabularyPageResponse(BaseModel):
+    items: list[VocabularyItemDetailResponse]
+    next_cursor: str | None = Field(alias="nextCursor")
+    estimated_total: int = Field(alias="estimatedTotal")
+
+    class Config:
+        populate_by_name = True
+
+
 @router.get("/vocabulary/search", response_model=list[VocabularyItemDetailResponse])
 async def search_vocabulary(
+    *,
     query: str = Query(..., min_length=1, max_length=100),
     limit: int = Query(50, ge=1, le=500),
+    prefix: bool = True,
+    source_language: str | None = None,
+    target_language: str | None = None,
     current_admin: dict = Depends(require_admin),
 ):
     try:
-        active_version_id = query_db("SELECT get_active_version_id()", one=True)
-        if not active_version_id:
+        version_id = await get_active_version_id()
+        if version_id is None:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="No active content version found",
             )
 
-        version_id = active_version_id["get_active_version_id"]
-
-        results = query_db(
-            """SELECT id, source_text, source_language, target_text, target_language,
-                      list_name, difficulty_level, source_usage_example, target_usage_example,
-                      is_active, created_at, updated_at
-               FROM vocabulary_items
-               WHERE version_id = %s
-                 AND (source_text ILIKE %s OR target_text ILIKE %s)
-               ORDER BY is_active DESC, source_text
-               LIMIT %s""",
-            (version_id, f"%{query}%", f"%{query}%", limit),
+        results = await search_vocabulary_items(
+            version_id,
+            query,
+            columns="""id, source_text, source_language, target_text, target_language,
+                       list_name, difficulty_level, source_usage_example, target_usage_example,
+                       is_active, created_at, updated_at""",
+            limit=limit,
+            prefix=prefix,
+            source_language=source_language,
+            target_language=target_language,
+            include_inactive=True,
         )
 
         output = []
@@ -107,7 +126,7 @@ async def get_vocabulary_item(
     current_admin: dict = Depends(require_admin),
 ):
     try:
-        item = query_db(
+        item = await async_query_db(
             """SELECT id, source_text, source_language, target_text, target_language,
                       list_name, difficulty_level, source_usage_example, target_usage_example,
                       is_active, created_at, updated_at
@@ -141,18 +160,17 @@ async def get_vocabulary_item(
 async def create_vocabulary_item(
     item_data: VocabularyItemCreate,
     current_admin: dict = Depends(require_admin),
+    conn=Depends(get_async_transaction, scope="function"),
 ):
     try:
-        active_version_id = query_db("SELECT get_active_version_id()", one=True)
-        if not active_version_id:
+        version_id = await get_active_version_id()
+        if version_id is None:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="No active content version found",
             )
 
-        version_id = active_version_id["get_active_version_id"]
-
-        result = execute_write_transaction(
+        result = await async_execute_write_transaction(
             """INSERT INTO vocabulary_items
                (version_id, source_text, source_language, target_text, target_language,
                 list_name, difficulty_level, source_usage_example, target_usage_example)
@@ -171,21 +189,25 @@ async def create_vocabulary_item(
             ),
             fetch_results=True,
             one=True,
+            conn=conn,
         )
 
-        execute_write_transaction(
+        await async_execute_write_transaction(
             """INSERT INTO content_changelog
                (version_id, change_type, vocabulary_item_id, new_values, changed_by)
                VALUES (%s, 'ADD', %s, %s, %s)""",
             (
                 version_id,
                 result["id"],
-                {
-                    "source_text": item_data.source_text,
-                    "target_text": item_data.target_text,
-                },
+                Jsonb(
+                    {
+                        "source_text": item_data.source_text,
+                        "target_text": item_data.target_text,
+                    }
+                ),
                 current_admin["username"],
             ),
+            conn=conn,
         )
 
         return {"message": "Vocabulary item created", "id": str(result["id"])}
@@ -205,12 +227,15 @@ async def update_vocabulary_item(
     item_id: str,
     item_data: VocabularyItemUpdate,
     current_admin: dict = Depends(require_admin),
+    conn=Depends(get_async_transaction, scope="function"),
 ):
     try:
-        existing_item = query_db(
-            "SELECT id, source_text, target_text, source_usage_example, target_usage_example, is_active, version_id FROM vocabulary_items WHERE id = %s",
+        existing_item = await async_query_db(
+            """SELECT id, source_text, target_text, source_usage_example, target_usage_example, is_active, version_id
+               FROM vocabulary_items WHERE id = %s FOR UPDATE""",
             (item_id,),
             one=True,
+            conn=conn,
         )
 
         if not existing_item:
@@ -258,22 +283,24 @@ async def update_vocabulary_item(
             )
 
         update_values.append(item_id)
-        execute_write_transaction(
+        await async_execute_write_transaction(
             f"UPDATE vocabulary_items SET {', '.join(update_fields)} WHERE id = %s",
             tuple(update_values),
+            conn=conn,
         )
 
-        execute_write_transaction(
+        await async_execute_write_transaction(
             """INSERT INTO content_changelog
                (version_id, change_type, vocabulary_item_id, old_values, new_values, changed_by)
                VALUES (%s, 'UPDATE', %s, %s, %s, %s)""",
             (
                 existing_item["version_id"],
                 item_id,
-                old_values,
-                new_values,
+                Jsonb(old_values),
+                Jsonb(new_values),
                 current_admin["username"],
             ),
+            conn=conn,
         )
 
         return {"message": "Vocabulary item updated"}
@@ -292,35 +319,41 @@ async def update_vocabulary_item(
 async def delete_vocabulary_item(
     item_id: str,
     current_admin: dict = Depends(require_admin),
+    conn=Depends(get_async_transaction, scope="function"),
 ):
     try:
-        existing_item = query_db(
-            "SELECT id, source_text, target_text, version_id FROM vocabulary_items WHERE id = %s",
+        existing_item = await async_query_db(
+            "SELECT id, source_text, target_text, version_id FROM vocabulary_items WHERE id = %s FOR UPDATE",
             (item_id,),
             one=True,
+            conn=conn,
         )
 
         if not existing_item:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Vocabulary item not found")
 
-        execute_write_transaction(
+        await async_execute_write_transaction(
             "UPDATE vocabulary_items SET is_active = FALSE WHERE id = %s",
             (item_id,),
+            conn=conn,
         )
 
-        execute_write_transaction(
+        await async_execute_write_transaction(
             """INSERT INTO content_changelog
                (version_id, change_type, vocabulary_item_id, old_values, changed_by)
                VALUES (%s, 'DELETE', %s, %s, %s)""",
             (
                 existing_item["version_id"],
                 item_id,
-                {
-                    "source_text": existing_item["source_text"],
-                    "target_text": existing_item["target_text"],
-                },
+                Jsonb(
+                    {
+                        "source_text": existing_item["source_text"],
+                        "target_text": existing_item["target_text"],
+                    }
+                ),
                 current_admin["username"],
             ),
+            conn=conn,
         )
 
         return {"message": "Vocabulary item deleted"}
@@ -335,55 +368,61 @@ async def delete_vocabulary_item(
         )
 
 
-@router.get("/vocabulary", response_model=list[VocabularyItemDetailResponse])
+@router.get("/vocabulary", response_model=VocabularyPageResponse)
 async def list_vocabulary(
     list_name: str | None = None,
     limit: int = Query(100, ge=1, le=1000),
-    offset: int = Query(0, ge=0),
+    cursor: str | None = None,
     current_admin: dict = Depends(require_admin),
 ):
     try:
-        active_version_id = query_db("SELECT get_active_version_id()", one=True)
-        if not active_version_id:
+        version_id = await get_active_version_id()
+        if version_id is None:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="No active content version found",
             )
 
-        version_id = active_version_id["get_active_version_id"]
-
+        conditions = ["version_id = %s"]
+        args = [version_id]
         if list_name:
-            results = query_db(
-                """SELECT id, source_text, source_language, target_text, target_language,
-                          list_name, difficulty_level, source_usage_example, target_usage_example,
-                          is_active, created_at, updated_at
-                   FROM vocabulary_items
-                   WHERE version_id = %s AND list_name = %s
-                   ORDER BY source_text
-                   LIMIT %s OFFSET %s""",
-                (version_id, list_name, limit, offset),
-            )
-        else:
-            results = query_db(
-                """SELECT id, source_text, source_language, target_text, target_language,
-                          list_name, difficulty_level, source_usage_example, target_usage_example,
-                          is_active, created_at, updated_at
-                   FROM vocabulary_items
-                   WHERE version_id = %s
-                   ORDER BY list_name, source_text
-                   LIMIT %s OFFSET %s""",
-                (version_id, limit, offset),
-            )
+            conditions.append("list_name = %s")
+            args.append(list_name)
+        estimated_total = await async_estimate_count(f"SELECT 1 FROM vocabulary_items WHERE {' AND '.join(conditions)}", tuple(args))
+
+        # Keyset pagination: resume strictly after the last row of the previous page, so every
+        # page is an index range scan on idx_vocab_version_keyset regardless of depth.
+        if cursor:
+            try:
+                after_list, after_text, after_id = decode_cursor(cursor, 3)
+                after = (str(after_list), str(after_text), UUID(after_id))
+            except (TypeError, ValueError):
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+            conditions.append("(list_name, source_text, id) > (%s, %s, %s)")
+            args.extend(after)
+
+        # camelCase aliases give rows the VocabularyItemDetailResponse shape, so they serialize as-is.
+        results = await async_query_db(
+            f"""SELECT id, source_text AS "sourceText", source_language AS "sourceLanguage",
+                       target_text AS "targetText", target_language AS "targetLanguage", list_name AS "listName",
+                       difficulty_level AS "difficultyLevel", source_usage_example AS "sourceUsageExample",
+                       target_usage_example AS "targetUsageExample", is_active AS "isActive",
+                       created_at AS "createdAt", updated_at AS "updatedAt"
+                FROM vocabulary_items
+                WHERE {" AND ".join(conditions)}
+                ORDER BY list_name, source_text, id
+                LIMIT %s""",
+            (*args, limit + 1),
+        )
 
-        output = []
-        for item in results:
-            item_dict = dict(item)
-            item_dict["id"] = str(item_dict["id"])
-            item_dict["created_at"] = item_dict["created_at"].isoformat()
-            item_dict["updated_at"] = item_dict["updated_at"].isoformat()
-            output.append(convert_keys_to_camel_case(item_dict))
+        next_cursor = None
+        if len(results) > limit:
+            results = results[:limit]
+            last = results[-1]
+            next_cursor = encode_cursor([last["listName"], last["sourceText"], str(last["id"])])
 
-        return output
+        # Trusted DB rows: skip per-row response_model validation.
+        return ORJSONResponse({"items": results, "nextCursor": next_cursor, "estimatedTotal": estimated_total})
 
     except HTTPException:
         raise
@@ -393,3 +432,11 @@ async def list_vocabulary(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to list vocabulary",
         )
+
+
+@router.get("/tts/cache-stats", response_model=TTSCacheStatsResponse)
+async def get_tts_cache_stats(
+    current_admin: dict = Depends(require_admin),
+    tts_service: TTSService = Depends(get_tts_service),
+):
+    return TTSCacheStatsResponse(**tts_service.get_cache_stats())
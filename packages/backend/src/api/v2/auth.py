@@ -1,15 +1,15 @@
-import hashlib
 import logging
 
-from core.database import execute_write_transaction, query_db
+from core.database import async_execute_write_transaction, async_query_db, get_async_transaction
 from core.security import (
+    async_hash_password,
+    async_verify_password,
+    consume_refresh_token,
     create_access_token,
     create_refresh_token,
     get_current_user,
-    hash_password,
-    verify_password,
-    verify_refresh_token,
 )
+from core.user_cache import user_cache
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from schemas.user import RefreshTokenRequest, TokenResponse, UserLogin, UserRegistration, UserResponse
 from slowapi import Limiter
@@ -29,15 +29,15 @@ limiter = Limiter(key_func=get_remote_address)
 async def register_user(request: Request, user_data: UserRegistration):
     logger.info(f"Starting registration for user: {user_data.username}")
     try:
-        existing_user = query_db("SELECT id FROM users WHERE username = %s", (user_data.username,), one=True)
+        existing_user = await async_query_db("SELECT id FROM users WHERE username = %s", (user_data.username,), one=True, primary=True)
         if existing_user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Username already exists",
             )
 
-        hashed_password = hash_password(user_data.password)
-        result = execute_write_transaction(
+        hashed_password = await async_hash_password(user_data.password)
+        result = await async_execute_write_transaction(
             "INSERT INTO users (username, password) VALUES (%s, %s) RETURNING id, is_admin",
             (user_data.username, hashed_password),
             fetch_results=True,
@@ -57,7 +57,7 @@ async def register_user(request: Request, user_data: UserRegistration):
         token = create_access_token(data={"userId": user_id, "sub": user_data.username, "isAdmin": is_admin})
 
         refresh_token, token_hash, expires_at = create_refresh_token()
-        execute_write_transaction(
+        await async_execute_write_transaction(
             "INSERT INTO refresh_tokens (user_id, token_hash, expires_at) VALUES (%s, %s, %s)",
             (user_id, token_hash, expires_at),
         )
@@ -84,13 +84,14 @@ async def register_user(request: Request, user_data: UserRegistration):
 async def login_user(request: Request, user_data: UserLogin):
     logger.info(f"Login attempt for user: {user_data.username}")
     try:
-        user = query_db(
+        user = await async_query_db(
             "SELECT id, username, password, is_admin FROM users WHERE username = %s",
             (user_data.username,),
             one=True,
+            primary=True,
         )
 
-        if not user or not verify_password(user_data.password, user["password"]):
+        if not user or not await async_verify_password(user_data.password, user["password"]):
             logger.warning(f"Invalid login attempt for user: {user_data.username}")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -101,7 +102,7 @@ async def login_user(request: Request, user_data: UserLogin):
         token = create_access_token(data={"userId": user["id"], "sub": user["username"], "isAdmin": is_admin})
 
         refresh_token, token_hash, expires_at = create_refresh_token()
-        execute_write_transaction(
+        await async_execute_write_transaction(
             "INSERT INTO refresh_tokens (user_id, token_hash, expires_at) VALUES (%s, %s, %s)",
             (user["id"], token_hash, expires_at),
         )
@@ -124,16 +125,17 @@ async def login_user(request: Request, user_data: UserLogin):
 
 @router.post("/refresh", response_model=TokenResponse)
 @limiter.limit("100/15minutes")
-async def refresh_access_token(request: Request, refresh_request: RefreshTokenRequest):
+async def refresh_access_token(
+    request: Request,
+    refresh_request: RefreshTokenRequest,
+    conn=Depends(get_async_transaction, scope="function"),
+):
     logger.info("Access token refresh attempt")
     try:
-        user_data = verify_refresh_token(refresh_request.refresh_token)
+        # Revokes the presented token as part of this request's transaction.
+        user_data = await consume_refresh_token(refresh_request.refresh_token, conn=conn)
 
-        user = query_db(
-            "SELECT id, username, is_admin FROM users WHERE id = %s",
-            (user_data["user_id"],),
-            one=True,
-        )
+        user = await user_cache.get(user_data["user_id"])
 
         if not user:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
@@ -142,16 +144,10 @@ async def refresh_access_token(request: Request, refresh_request: RefreshTokenRe
         new_access_token = create_access_token(data={"userId": user["id"], "sub": user["username"], "isAdmin": is_admin})
 
         new_refresh_token, token_hash, expires_at = create_refresh_token()
-        old_token_hash = hashlib.sha256(refresh_request.refresh_token.encode()).hexdigest()
-
-        execute_write_transaction(
-            "UPDATE refresh_tokens SET revoked_at = NOW() WHERE token_hash = %s",
-            (old_token_hash,),
-        )
-
-        execute_write_transaction(
+        await async_execute_write_transaction(
             "INSERT INTO refresh_tokens (user_id, token_hash, expires_at) VALUES (%s, %s, %s)",
             (user["id"], token_hash, expires_at),
+            conn=conn,
         )
 
         logger.info(f"Access token refreshed for user: {user['username']}")
@@ -177,12 +173,14 @@ async def refresh_access_token(request: Request, refresh_request: RefreshTokenRe
 async def delete_account(current_user: dict = Depends(get_current_user)):
     logger.info(f"Account deletion request for user: {current_user['username']}")
     try:
-        result = execute_write_transaction("DELETE FROM users WHERE id = %s", (current_user["user_id"],))
+        result = await async_execute_write_transaction("DELETE FROM users WHERE id = %s", (current_user["user_id"],))
 
         if result == 0:
             logger.warning(f"Account deletion failed - user not found: {current_user['username']}")
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
+        user_cache.invalidate(current_user["user_id"])
+
         logger.info(f"Account successfully deleted for user: {current_user['username']}")
         return {"message": "Account deleted successfully"}
 
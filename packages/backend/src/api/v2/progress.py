@@ -1,33 +1,75 @@
+import datetime as dt
 import logging
+from uuid import UUID
 
-from core.database import execute_write_transaction, query_db
+from core.config import PROGRESS_SYNC_SETTLE_SECONDS
+from core.content_version import get_active_version_id
+from core.database import async_execute_write_transaction, async_query_db, get_async_read_db, get_async_transaction
 from core.security import get_current_user
-from fastapi import APIRouter, Depends, HTTPException, status
-from schemas.progress import ProgressUpdateRequest, UserProgressResponse
+from core.spaced_repetition import MAX_FOCUS_POOL_SIZE, PRACTICE_LEVEL_SOURCES, apply_answer
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
+from schemas.progress import (
+    PracticeAnswerRequest,
+    PracticeAnswerResponse,
+    PracticeItemResponse,
+    ProgressBatchFailure,
+    ProgressBatchRequest,
+    ProgressBatchResponse,
+    ProgressSyncResponse,
+    ProgressUpdateRequest,
+    UserProgressResponse,
+)
 from utils import convert_keys_to_camel_case
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/user", tags=["Progress"])
 
+# UserProgressResponse fields, aliased to their camelCase names so rows serialize as-is.
+PROGRESS_COLUMNS = """up.vocabulary_item_id AS "vocabularyItemId", vi.source_text AS "sourceText",
+                      vi.source_language AS "sourceLanguage", vi.target_language AS "targetLanguage", up.level,
+                      up.queue_position AS "queuePosition", up.correct_count AS "correctCount",
+                      up.incorrect_count AS "incorrectCount", up.consecutive_correct AS "consecutiveCorrect",
+                      up.last_practiced_at AS "lastPracticed"
+"""
 
-@router.get("/progress", response_model=list[UserProgressResponse])
-async def get_user_progress(list_name: str | None = None, current_user: dict = Depends(get_current_user)):
+_EPOCH = dt.datetime(1970, 1, 1, tzinfo=dt.UTC)
+
+
+def _encode_sync_cursor(last_practiced_at: dt.datetime, vocabulary_item_id: UUID) -> str:
+    """Opaque, URL-safe delta-sync watermark: microseconds since epoch plus the row's item id as tiebreaker."""
+    return f"{(last_practiced_at - _EPOCH) // dt.timedelta(microseconds=1)}_{vocabulary_item_id}"
+
+
+def _decode_sync_cursor(cursor: str) -> tuple[dt.datetime, UUID]:
+    micros, _, item_id = cursor.partition("_")
     try:
+        return _EPOCH + dt.timedelta(microseconds=int(micros)), UUID(item_id)
+    except (ValueError, OverflowError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid since cursor")
+
+
+@router.get("/progress", response_model=list[UserProgressResponse] | ProgressSyncResponse)
+async def get_user_progress(
+    list_name: str | None = None,
+    since: str | None = None,
+    limit: int = Query(1000, ge=1, le=5000),
+    current_user: dict = Depends(get_current_user),
+):
+    try:
+        if since is not None:
+            return await _get_progress_changes(current_user["user_id"], since, limit, list_name)
+
         if list_name:
-            active_version_id = query_db("SELECT get_active_version_id()", one=True)
-            if not active_version_id:
+            version_id = await get_active_version_id()
+            if version_id is None:
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     detail="No active content version found",
                 )
 
-            version_id = active_version_id["get_active_version_id"]
-
-            progress = query_db(
-                """SELECT up.vocabulary_item_id, up.level, up.queue_position,
-                          up.correct_count, up.incorrect_count, up.consecutive_correct,
-                          up.last_practiced_at as last_practiced,
-                          vi.source_text, vi.source_language, vi.target_language
+            progress = await async_query_db(
+                f"""SELECT {PROGRESS_COLUMNS}
                    FROM user_progress up
                    JOIN vocabulary_items vi ON up.vocabulary_item_id = vi.id
                    WHERE up.user_id = %s AND vi.list_name = %s AND vi.version_id = %s AND vi.is_active = TRUE
@@ -35,11 +77,8 @@ async def get_user_progress(list_name: str | None = None, current_user: dict = D
                 (current_user["user_id"], list_name, version_id),
             )
         else:
-            progress = query_db(
-                """SELECT up.vocabulary_item_id, up.level, up.queue_position,
-                          up.correct_count, up.incorrect_count, up.consecutive_correct,
-                          up.last_practiced_at as last_practiced,
-                          vi.source_text, vi.source_language, vi.target_language
+            progress = await async_query_db(
+                f"""SELECT {PROGRESS_COLUMNS}
                    FROM user_progress up
                    JOIN vocabulary_items vi ON up.vocabulary_item_id = vi.id
                    WHERE up.user_id = %s
@@ -47,15 +86,8 @@ async def get_user_progress(list_name: str | None = None, current_user: dict = D
                 (current_user["user_id"],),
             )
 
-        result = []
-        for p in progress:
-            item_dict = dict(p)
-            item_dict["vocabulary_item_id"] = str(item_dict["vocabulary_item_id"])
-            if item_dict.get("last_practiced"):
-                item_dict["last_practiced"] = item_dict["last_practiced"].isoformat()
-            result.append(convert_keys_to_camel_case(item_dict))
-
-        return result
+        # Rows already have the response shape; skip per-row response_model validation.
+        return ORJSONResponse(progress)
 
     except HTTPException:
         raise
@@ -67,35 +99,89 @@ async def get_user_progress(list_name: str | None = None, current_user: dict = D
         )
 
 
+async def _get_progress_changes(user_id: int, since: str, limit: int, list_name: str | None) -> ORJSONResponse:
+    """One page of the user's progress rows changed after the since watermark, oldest first.
+
+    With list_name, only that list's active words are returned (as in the non-delta list form) and
+    the resulting cursor is only meaningful for that list. An empty since starts from the beginning; clients store nextSince and pass it back, paging while
+    hasMore is true. Rows newer than PROGRESS_SYNC_SETTLE_SECONDS are held back until they can no longer
+    be overtaken by a slower transaction, so the watermark never skips a late commit. Deletions are not
+    reported; clients resync from scratch when the content version changes.
+    """
+    conditions = "up.user_id = %s AND up.last_practiced_at <= NOW() - %s * INTERVAL '1 second'"
+    args = [user_id, PROGRESS_SYNC_SETTLE_SECONDS]
+    if since:
+        conditions += " AND (up.last_practiced_at, up.vocabulary_item_id) > (%s, %s)"
+        args.extend(_decode_sync_cursor(since))
+    if list_name:
+        version_id = await get_active_version_id()
+        if version_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="No active content version found",
+            )
+        conditions += " AND vi.list_name = %s AND vi.version_id = %s AND vi.is_active = TRUE"
+        args.extend((list_name, version_id))
+
+    # Primary only: a lagging replica could hide rows the watermark then moves past.
+    progress = await async_query_db(
+        f"""SELECT {PROGRESS_COLUMNS}
+           FROM user_progress up
+           JOIN vocabulary_items vi ON up.vocabulary_item_id = vi.id
+           WHERE {conditions}
+           ORDER BY up.last_practiced_at, up.vocabulary_item_id
+           LIMIT %s""",
+        (*args, limit + 1),
+        primary=True,
+    )
+
+    has_more = len(progress) > limit
+    progress = progress[:limit]
+    next_since = _encode_sync_cursor(progress[-1]["lastPracticed"], progress[-1]["vocabularyItemId"]) if progress else since
+    return ORJSONResponse({"items": progress, "nextSince": next_since, "hasMore": has_more})
+
+
 @router.post("/progress")
-async def save_user_progress(progress_data: ProgressUpdateRequest, current_user: dict = Depends(get_current_user)):
+async def save_user_progress(
+    progress_data: ProgressUpdateRequest,
+    current_user: dict = Depends(get_current_user),
+    conn=Depends(get_async_transaction, scope="function"),
+):
     try:
-        active_version_id = query_db("SELECT get_active_version_id()", one=True)
-        if not active_version_id:
+        version_id = await get_active_version_id()
+        if version_id is None:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="No active content version found",
             )
 
-        version_id = active_version_id["get_active_version_id"]
-
-        vocab_item = query_db(
-            """SELECT id FROM vocabulary_items
-               WHERE source_text = %s AND source_language = %s AND target_language = %s
-               AND version_id = %s AND is_active = TRUE""",
-            (progress_data.source_text, progress_data.source_language, progress_data.target_language, version_id),
-            one=True,
-        )
+        if progress_data.vocabulary_item_id is not None:
+            # Primary-key probe; the text form below is kept for older clients.
+            vocab_item = await async_query_db(
+                "SELECT id FROM vocabulary_items WHERE id = %s AND version_id = %s AND is_active = TRUE",
+                (progress_data.vocabulary_item_id, version_id),
+                one=True,
+                conn=conn,
+            )
+        else:
+            vocab_item = await async_query_db(
+                """SELECT id FROM vocabulary_items
+                   WHERE source_text = %s AND source_language = %s AND target_language = %s
+                   AND version_id = %s AND is_active = TRUE""",
+                (progress_data.source_text, progress_data.source_language, progress_data.target_language, version_id),
+                one=True,
+                conn=conn,
+            )
 
         if not vocab_item:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Vocabulary item not found: {progress_data.source_text}",
+                detail=f"Vocabulary item not found: {progress_data.vocabulary_item_id or progress_data.source_text}",
             )
 
         vocabulary_item_id = vocab_item["id"]
 
-        execute_write_transaction(
+        await async_execute_write_transaction(
             """INSERT INTO user_progress
                (user_id, vocabulary_item_id, level, queue_position, correct_count, incorrect_count, consecutive_correct, last_practiced_at)
                VALUES (%s, %s, %s, %s, %s, %s, %s, NOW())
@@ -116,6 +202,7 @@ async def save_user_progress(progress_data: ProgressUpdateRequest, current_user:
                 progress_data.incorrect_count,
                 progress_data.consecutive_correct,
             ),
+            conn=conn,
         )
 
         return {"message": "Progress updated successfully"}
@@ -128,3 +215,310 @@ async def save_user_progress(progress_data: ProgressUpdateRequest, current_user:
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update progress",
         )
+
+
+@router.post("/progress/batch", response_model=ProgressBatchResponse)
+async def save_user_progress_batch(
+    batch: ProgressBatchRequest,
+    current_user: dict = Depends(get_current_user),
+    conn=Depends(get_async_transaction, scope="function"),
+):
+    try:
+        version_id = await get_active_version_id()
+        if version_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="No active content version found",
+            )
+
+        requested_ids = list({item.vocabulary_item_id for item in batch.items if item.vocabulary_item_id is not None})
+        valid_ids = set()
+        if requested_ids:
+            rows = await async_query_db(
+                """SELECT id FROM vocabulary_items
+                   WHERE id = ANY(%s::uuid[]) AND version_id = %s AND is_active = TRUE""",
+                (requested_ids, version_id),
+                conn=conn,
+            )
+            valid_ids = {row["id"] for row in rows}
+
+        keys = list({(item.source_text, item.source_language, item.target_language) for item in batch.items if item.vocabulary_item_id is None})
+        ids_by_key = {}
+        if keys:
+            vocab_items = await async_query_db(
+                """SELECT vi.id, vi.source_text, vi.source_language, vi.target_language
+                   FROM vocabulary_items vi
+                   JOIN unnest(%s::text[], %s::text[], %s::text[]) AS k(source_text, source_language, target_language)
+                     ON vi.source_text = k.source_text
+                    AND vi.source_language = k.source_language
+                    AND vi.target_language = k.target_language
+                   WHERE vi.version_id = %s AND vi.is_active = TRUE""",
+                ([k[0] for k in keys], [k[1] for k in keys], [k[2] for k in keys], version_id),
+                conn=conn,
+            )
+            ids_by_key = {(v["source_text"], v["source_language"], v["target_language"]): v["id"] for v in vocab_items}
+
+        # Later entries for the same word win; ON CONFLICT cannot touch one row twice per statement.
+        updates = {}
+        failed = []
+        for index, item in enumerate(batch.items):
+            if item.vocabulary_item_id is not None:
+                vocabulary_item_id = item.vocabulary_item_id if item.vocabulary_item_id in valid_ids else None
+            else:
+                vocabulary_item_id = ids_by_key.get((item.source_text, item.source_language, item.target_language))
+            if vocabulary_item_id is None:
+                failed.append(
+                    ProgressBatchFailure(
+                        index=index,
+                        vocabulary_item_id=str(item.vocabulary_item_id) if item.vocabulary_item_id else None,
+                        source_text=item.source_text,
+                        error="Vocabulary item not found",
+                    )
+                )
+                continue
+            updates[vocabulary_item_id] = item
+
+        if updates:
+            items = list(updates.values())
+            await async_execute_write_transaction(
+                """INSERT INTO user_progress
+                   (user_id, vocabulary_item_id, level, queue_position, correct_count, incorrect_count, consecutive_correct, last_practiced_at)
+                   SELECT %s, u.*, NOW()
+                   FROM unnest(%s::uuid[], %s::smallint[], %s::int[], %s::int[], %s::int[], %s::smallint[])
+                        AS u(vocabulary_item_id, level, queue_position, correct_count, incorrect_count, consecutive_correct)
+                   ON CONFLICT (user_id, vocabulary_item_id)
+                   DO UPDATE SET
+                       level = EXCLUDED.level,
+                       queue_position = EXCLUDED.queue_position,
+                       correct_count = EXCLUDED.correct_count,
+                       incorrect_count = EXCLUDED.incorrect_count,
+                       consecutive_correct = EXCLUDED.consecutive_correct,
+                       last_practiced_at = EXCLUDED.last_practiced_at""",
+                (
+                    current_user["user_id"],
+                    list(updates.keys()),
+                    [item.level for item in items],
+                    [item.queue_position for item in items],
+                    [item.correct_count for item in items],
+                    [item.incorrect_count for item in items],
+                    [item.consecutive_correct for item in items],
+                ),
+                conn=conn,
+            )
+
+        return ProgressBatchResponse(saved=len(updates), failed=failed)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating progress batch: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update progress",
+        )
+
+
+@router.get("/practice/next", response_model=list[PracticeItemResponse])
+async def get_next_practice_items(
+    list_name: str,
+    level: int = Query(1, ge=1, le=4),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: dict = Depends(get_current_user),
+    conn=Depends(get_async_read_db),
+):
+    try:
+        version_id = await get_active_version_id()
+        if version_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="No active content version found",
+            )
+
+        source_levels = PRACTICE_LEVEL_SOURCES[level]
+        items = await async_query_db(
+            """SELECT vi.id AS vocabulary_item_id, vi.source_text, vi.source_language, vi.target_text,
+                      vi.target_language, vi.source_usage_example, vi.target_usage_example,
+                      up.level, up.queue_position, up.consecutive_correct, up.correct_count, up.incorrect_count
+               FROM user_progress up
+               JOIN vocabulary_items vi ON up.vocabulary_item_id = vi.id
+               WHERE up.user_id = %s AND up.level = ANY(%s::smallint[])
+                 AND vi.list_name = %s AND vi.version_id = %s AND vi.is_active = TRUE
+               ORDER BY array_position(%s::smallint[], up.level), up.queue_position, up.last_practiced_at NULLS FIRST
+               LIMIT %s""",
+            (current_user["user_id"], source_levels, list_name, version_id, source_levels, limit),
+            conn=conn,
+        )
+
+        if level == 1 and len(items) < limit:
+            # Top up the focus pool with LEVEL_0 words: demoted ones first, then never-seen ones
+            # in a stable pseudo-random order (by UUID).
+            focus_count = await async_query_db(
+                """SELECT COUNT(*) AS count
+                   FROM user_progress up
+                   JOIN vocabulary_items vi ON up.vocabulary_item_id = vi.id
+                   WHERE up.user_id = %s AND up.level = 1
+                     AND vi.list_name = %s AND vi.version_id = %s AND vi.is_active = TRUE""",
+                (current_user["user_id"], list_name, version_id),
+                one=True,
+                conn=conn,
+            )
+            free_slots = min(MAX_FOCUS_POOL_SIZE - focus_count["count"], limit - len(items))
+            if free_slots > 0:
+                items += await async_query_db(
+                    """SELECT vi.id AS vocabulary_item_id, vi.source_text, vi.source_language, vi.target_text,
+                              vi.target_language, vi.source_usage_example, vi.target_usage_example,
+                              1 AS level, up.queue_position,
+                              COALESCE(up.consecutive_correct, 0) AS consecutive_correct,
+                              COALESCE(up.correct_count, 0) AS correct_count,
+                              COALESCE(up.incorrect_count, 0) AS incorrect_count
+                       FROM vocabulary_items vi
+                       LEFT JOIN user_progress up ON up.vocabulary_item_id = vi.id AND up.user_id = %s
+                       WHERE vi.list_name = %s AND vi.version_id = %s AND vi.is_active = TRUE
+                         AND (up.vocabulary_item_id IS NULL OR up.level = 0)
+                       ORDER BY up.queue_position NULLS LAST, vi.id
+                       LIMIT %s""",
+                    (current_user["user_id"], list_name, version_id, free_slots),
+                    conn=conn,
+                )
+
+        result = []
+        for item in items:
+            item_dict = dict(item)
+            item_dict["vocabulary_item_id"] = str(item_dict["vocabulary_item_id"])
+            result.append(convert_keys_to_camel_case(item_dict))
+
+        return result
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching next practice items: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch practice items",
+        )
+
+
+@router.post("/practice/answer", response_model=PracticeAnswerResponse)
+async def submit_practice_answer(
+    answer: PracticeAnswerRequest,
+    current_user: dict = Depends(get_current_user),
+    conn=Depends(get_async_transaction, scope="function"),
+):
+    user_id = current_user["user_id"]
+    try:
+        version_id = await get_active_version_id()
+        if version_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="No active content version found",
+            )
+
+        vocab_item = await async_query_db(
+            "SELECT list_name FROM vocabulary_items WHERE id = %s AND version_id = %s AND is_active = TRUE",
+            (answer.vocabulary_item_id, version_id),
+            one=True,
+            conn=conn,
+        )
+        if not vocab_item:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Vocabulary item not found")
+
+        # Row lock serializes concurrent answers for the same word within this transaction.
+        progress = await async_query_db(
+            """SELECT level, consecutive_correct, recent_history, correct_count, incorrect_count
+               FROM user_progress
+               WHERE user_id = %s AND vocabulary_item_id = %s
+               FOR UPDATE""",
+            (user_id, answer.vocabulary_item_id),
+            one=True,
+            conn=conn,
+        )
+        if progress:
+            # A LEVEL_0 word is only served after being promoted into the LEVEL_1 focus pool.
+            previous_level = max(progress["level"], 1)
+            outcome = apply_answer(previous_level, progress["consecutive_correct"], progress["recent_history"] or [], answer.is_correct)
+            correct_count = progress["correct_count"]
+            incorrect_count = progress["incorrect_count"]
+        else:
+            previous_level = 1
+            outcome = apply_answer(previous_level, 0, [], answer.is_correct)
+            correct_count = 0
+            incorrect_count = 0
+
+        if answer.is_correct:
+            correct_count += 1
+        else:
+            incorrect_count += 1
+
+        queue_filter = """FROM user_progress up
+                          JOIN vocabulary_items vi ON up.vocabulary_item_id = vi.id
+                          WHERE up.user_id = %s AND up.level = %s AND up.vocabulary_item_id <> %s
+                            AND vi.list_name = %s AND vi.version_id = %s AND vi.is_active = TRUE"""
+        queue_args = (user_id, outcome.level, answer.vocabulary_item_id, vocab_item["list_name"], version_id)
+
+        # Positions are a sort key, not dense indexes: re-inserting at index N takes the position
+        # of the word currently N-th in the queue, with last_practiced_at breaking the tie.
+        slot = None
+        if outcome.queue_offset is not None:
+            slot = await async_query_db(
+                f"""SELECT up.queue_position {queue_filter}
+                    ORDER BY up.queue_position, up.last_practiced_at NULLS FIRST
+                    OFFSET %s LIMIT 1""",
+                (*queue_args, outcome.queue_offset),
+                one=True,
+                conn=conn,
+            )
+        if slot is None:
+            slot = await async_query_db(
+                f"SELECT COALESCE(MAX(up.queue_position) + 1, 0) AS queue_position {queue_filter}",
+                queue_args,
+                one=True,
+                conn=conn,
+            )
+        queue_position = slot["queue_position"]
+
+        await async_execute_write_transaction(
+            """INSERT INTO user_progress
+               (user_id, vocabulary_item_id, level, queue_position, correct_count, incorrect_count,
+                consecutive_correct, recent_history, last_practiced_at)
+               VALUES (%s, %s, %s, %s, %s, %s, %s, %s, NOW())
+               ON CONFLICT (user_id, vocabulary_item_id)
+               DO UPDATE SET
+                   level = EXCLUDED.level,
+                   queue_position = EXCLUDED.queue_position,
+                   correct_count = EXCLUDED.correct_count,
+                   incorrect_count = EXCLUDED.incorrect_count,
+                   consecutive_correct = EXCLUDED.consecutive_correct,
+                   recent_history = EXCLUDED.recent_history,
+                   last_practiced_at = EXCLUDED.last_practiced_at""",
+            (
+                user_id,
+                answer.vocabulary_item_id,
+                outcome.level,
+                queue_position,
+                correct_count,
+                incorrect_count,
+                outcome.consecutive_correct,
+                outcome.recent_history,
+            ),
+            conn=conn,
+        )
+
+        return PracticeAnswerResponse(
+            vocabulary_item_id=str(answer.vocabulary_item_id),
+            previous_level=previous_level,
+            level=outcome.level,
+            queue_position=queue_position,
+            consecutive_correct=outcome.consecutive_correct,
+            correct_count=correct_count,
+            incorrect_count=incorrect_count,
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error submitting practice answer: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to submit answer",
+        )
@@ -1,22 +1,55 @@
 import base64
+import hashlib
 import logging
+import re
 
+from core.response_cache import etag_matches
 from core.security import get_current_user
-from fastapi import APIRouter, Depends, HTTPException, Request, status
-from schemas.tts import TTSLanguagesResponse, TTSRequest, TTSResponse
+from fastapi import APIRouter, Depends, HTTPException, Path, Request, Response, status
+from schemas.tts import TTSAudioResponse, TTSLanguagesResponse, TTSRequest, TTSResponse
 from slowapi import Limiter
 from slowapi.util import get_remote_address
+from tts_service import TTSService, get_tts_service
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/tts", tags=["Text-to-Speech"])
 limiter = Limiter(key_func=get_remote_address)
 
+AUDIO_CACHE_CONTROL = "public, max-age=31536000, immutable"
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
 
-def get_tts_service():
-    from core.database import db_pool
-    from tts_service import TTSService
 
-    return TTSService(db_pool)
+class RangeNotSatisfiableError(Exception):
+    pass
+
+
+def _parse_range(range_header: str, size: int) -> tuple[int, int] | None:
+    """Parse a single-range `bytes=` header into inclusive (start, end) offsets.
+
+    Returns None for headers to ignore (malformed, reversed or multi-range), which per RFC 9110
+    means serving the full body. Raises RangeNotSatisfiableError when a well-formed range starts past
+    the end of the body.
+    """
+    match = RANGE_PATTERN.match(range_header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+
+    start_str, end_str = match.groups()
+    if start_str:
+        start = int(start_str)
+        if end_str and int(end_str) < start:
+            return None
+        if start >= size:
+            raise RangeNotSatisfiableError
+        end = min(int(end_str), size - 1) if end_str else size - 1
+    else:
+        suffix_length = int(end_str)
+        if suffix_length == 0 or size == 0:
+            raise RangeNotSatisfiableError
+        start = max(size - suffix_length, 0)
+        end = size - 1
+
+    return start, end
 
 
 @router.post("/synthesize", response_model=TTSResponse)
@@ -25,10 +58,10 @@ async def synthesize_speech(
     request: Request,
     tts_data: TTSRequest,
     current_user: dict = Depends(get_current_user),
+    tts_service: TTSService = Depends(get_tts_service),
 ):
     try:
-        tts_service = get_tts_service()
-        audio_data = tts_service.synthesize_speech(tts_data.text, tts_data.language)
+        audio_data = await tts_service.synthesize_speech(tts_data.text, tts_data.language)
 
         if not audio_data:
             raise HTTPException(
@@ -55,10 +88,86 @@ async def synthesize_speech(
         )
 
 
+@router.post("/audio", response_model=TTSAudioResponse)
+@limiter.limit("100/minute")
+async def prepare_audio(
+    request: Request,
+    tts_data: TTSRequest,
+    current_user: dict = Depends(get_current_user),
+    tts_service: TTSService = Depends(get_tts_service),
+):
+    try:
+        audio_data = await tts_service.synthesize_speech(tts_data.text, tts_data.language)
+
+        if not audio_data:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Failed to synthesize speech",
+            )
+
+        return TTSAudioResponse(cache_key=tts_service.get_cache_key(tts_data.text.strip(), tts_data.language))
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"TTS synthesis error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Speech synthesis failed",
+        )
+
+
+@router.get("/audio/{cache_key}")
+async def get_audio(
+    request: Request,
+    cache_key: str = Path(..., pattern="^[0-9a-f]{32}$"),
+    tts_service: TTSService = Depends(get_tts_service),
+):
+    # Content-addressed and only serves audio that was already synthesized through an
+    # authenticated call, so it is public and cacheable by browsers and proxies.
+    audio_data = await tts_service.get_cached_audio(cache_key)
+    if not audio_data:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Audio not found")
+
+    size = len(audio_data)
+    etag = f'"{hashlib.sha256(audio_data).hexdigest()[:32]}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": AUDIO_CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+    }
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() == etag):
+        try:
+            byte_range = _parse_range(range_header, size)
+        except RangeNotSatisfiableError:
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={**headers, "Content-Range": f"bytes */{size}"},
+            )
+        if byte_range is not None:
+            start, end = byte_range
+            return Response(
+                content=audio_data[start : end + 1],
+                status_code=status.HTTP_206_PARTIAL_CONTENT,
+                media_type="audio/mpeg",
+                headers={**headers, "Content-Range": f"bytes {start}-{end}/{size}"},
+            )
+
+    return Response(content=audio_data, media_type="audio/mpeg", headers=headers)
+
+
 @router.get("/languages", response_model=TTSLanguagesResponse)
-async def get_tts_languages(current_user: dict = Depends(get_current_user)):
+async def get_tts_languages(
+    current_user: dict = Depends(get_current_user),
+    tts_service: TTSService = Depends(get_tts_service),
+):
     try:
-        tts_service = get_tts_service()
         return TTSLanguagesResponse(
             available=tts_service.is_available(),
             supported_languages=tts_service.get_supported_languages(),
@@ -1,6 +1,6 @@
 import logging
 
-from core.database import query_db
+from core.database import async_query_db
 from core.security import get_current_user
 from fastapi import APIRouter, Depends, HTTPException, status
 from schemas.version import ContentVersionResponse
@@ -13,7 +13,7 @@ router = APIRouter(prefix="/api", tags=["Content Version"])
 @router.get("/content-version", response_model=ContentVersionResponse)
 async def get_active_content_version(current_user: dict = Depends(get_current_user)):
     try:
-        version = query_db(
+        version = await async_query_db(
             "SELECT id as version_id, version_name, is_active FROM content_versions WHERE is_active = TRUE LIMIT 1",
             one=True,
         )
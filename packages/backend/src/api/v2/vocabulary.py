@@ -1,9 +1,12 @@
 import logging
 
-from core.database import query_db
+from core.content_version import get_active_version_id
+from core.database import async_query_db, get_async_read_db
+from core.response_cache import cached_json_response, content_response_cache, get_changelog_high_water_mark
 from core.security import get_current_user
-from fastapi import APIRouter, Depends, HTTPException, status
-from schemas.vocabulary import VocabularyItemResponse, WordListResponse
+from core.vocabulary_search import search_vocabulary_items
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from schemas.vocabulary import VocabularyItemResponse, VocabularySearchResultResponse, WordListResponse
 from utils import convert_keys_to_camel_case
 
 logger = logging.getLogger(__name__)
@@ -11,27 +14,32 @@ router = APIRouter(prefix="/api", tags=["Vocabulary"])
 
 
 @router.get("/word-lists", response_model=list[WordListResponse])
-async def get_word_lists(current_user: dict = Depends(get_current_user)):
+async def get_word_lists(request: Request, current_user: dict = Depends(get_current_user), conn=Depends(get_async_read_db)):
     logger.debug(f"Fetching word lists for user: {current_user['username']}")
     try:
-        active_version_id = query_db("SELECT get_active_version_id()", one=True)
-        if not active_version_id:
+        version_id = await get_active_version_id()
+        if version_id is None:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="No active content version found",
             )
 
-        version_id = active_version_id["get_active_version_id"]
+        cache_key = ("word-lists", version_id, await get_changelog_high_water_mark(conn))
+        cached = content_response_cache.get(cache_key)
+        if cached:
+            return cached_json_response(request, cached)
 
-        lists = query_db(
+        lists = await async_query_db(
             """SELECT list_name, COUNT(*) as word_count
                FROM vocabulary_items
                WHERE version_id = %s AND is_active = TRUE
                GROUP BY list_name
                ORDER BY list_name""",
             (version_id,),
+            conn=conn,
         )
-        return [convert_keys_to_camel_case(dict(item)) for item in lists]
+        result = [convert_keys_to_camel_case(dict(item)) for item in lists]
+        return cached_json_response(request, content_response_cache.put(cache_key, result))
 
     except HTTPException:
         raise
@@ -44,33 +52,38 @@ async def get_word_lists(current_user: dict = Depends(get_current_user)):
 
 
 @router.get("/translations", response_model=list[VocabularyItemResponse])
-async def get_translations(list_name: str, current_user: dict = Depends(get_current_user)):
+async def get_translations(
+    request: Request,
+    list_name: str,
+    current_user: dict = Depends(get_current_user),
+    conn=Depends(get_async_read_db),
+):
     try:
-        active_version_id = query_db("SELECT get_active_version_id()", one=True)
-        if not active_version_id:
+        version_id = await get_active_version_id()
+        if version_id is None:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="No active content version found",
             )
 
-        version_id = active_version_id["get_active_version_id"]
+        cache_key = ("translations", list_name, version_id, await get_changelog_high_water_mark(conn))
+        cached = content_response_cache.get(cache_key)
+        if cached:
+            return cached_json_response(request, cached)
 
-        translations = query_db(
-            """SELECT id, source_text, source_language, target_text, target_language,
-                      list_name, source_usage_example, target_usage_example
+        # camelCase aliases give rows the VocabularyItemResponse shape, so they are cached as-is.
+        translations = await async_query_db(
+            """SELECT id, source_text AS "sourceText", source_language AS "sourceLanguage",
+                      target_text AS "targetText", target_language AS "targetLanguage", list_name AS "listName",
+                      source_usage_example AS "sourceUsageExample", target_usage_example AS "targetUsageExample"
                FROM vocabulary_items
                WHERE list_name = %s AND version_id = %s AND is_active = TRUE
                ORDER BY source_text""",
             (list_name, version_id),
+            conn=conn,
         )
 
-        result = []
-        for t in translations:
-            item_dict = dict(t)
-            item_dict["id"] = str(item_dict["id"])
-            result.append(convert_keys_to_camel_case(item_dict))
-
-        return result
+        return cached_json_response(request, content_response_cache.put(cache_key, translations))
 
     except HTTPException:
         raise
@@ -80,3 +93,51 @@ async def get_translations(list_name: str, current_user: dict = Depends(get_curr
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch word pairs",
         )
+
+
+@router.get("/vocabulary/search", response_model=list[VocabularySearchResultResponse])
+async def search_vocabulary(
+    *,
+    query: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    prefix: bool = True,
+    source_language: str | None = None,
+    target_language: str | None = None,
+    current_user: dict = Depends(get_current_user),
+):
+    try:
+        version_id = await get_active_version_id()
+        if version_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="No active content version found",
+            )
+
+        results = await search_vocabulary_items(
+            version_id,
+            query,
+            columns="""id, source_text, source_language, target_text, target_language,
+                       list_name, source_usage_example, target_usage_example""",
+            limit=limit,
+            prefix=prefix,
+            source_language=source_language,
+            target_language=target_language,
+        )
+
+        output = []
+        for item in results:
+            item_dict = dict(item)
+            item_dict["id"] = str(item_dict["id"])
+            item_dict["score"] = round(float(item_dict["score"]), 4)
+            output.append(convert_keys_to_camel_case(item_dict))
+
+        return output
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error searching vocabulary: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Search failed",
+        )
@@ -0,0 +1,133 @@
+import zlib
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Preferred first when the client accepts several encodings with the same q-value.
+SUPPORTED_ENCODINGS = ("br", "gzip")
+COMPRESSIBLE_CONTENT_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+# Per-request compression favours speed; bodies compressed once and cached can afford more.
+DYNAMIC_LEVELS = {"br": 4, "gzip": 6}
+CACHED_LEVELS = {"br": 9, "gzip": 9}
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """Pick the content-coding to respond with from an Accept-Encoding header, or None for identity."""
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+
+    best = None
+    for coding in SUPPORTED_ENCODINGS:
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > 0 and (best is None or weight > best[1]):
+            best = (coding, weight)
+    return best[0] if best else None
+
+
+def is_compressible(content_type: str | None) -> bool:
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_CONTENT_TYPES)
+
+
+def compress(body: bytes, encoding: str, level: int | None = None) -> bytes:
+    level = DYNAMIC_LEVELS[encoding] if level is None else level
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(body) + compressor.flush()
+
+
+class _StreamCompressor:
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            compressor = brotli.Compressor(quality=DYNAMIC_LEVELS["br"])
+            self.compress, self.finish = compressor.process, compressor.finish
+        else:
+            compressor = zlib.compressobj(DYNAMIC_LEVELS["gzip"], zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self.compress, self.finish = compressor.compress, compressor.flush
+
+
+class CompressionMiddleware:
+    """Compresses compressible responses of at least minimum_size bytes with brotli or gzip.
+
+    Responses that already carry a Content-Encoding (e.g. pre-compressed cached bodies) are
+    passed through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        start_message: Message | None = None
+        compressor: _StreamCompressor | None = None
+        passthrough = False
+
+        async def send_wrapper(message: Message):
+            nonlocal start_message, compressor, passthrough
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if not is_compressible(headers.get("content-type")) or "content-encoding" in headers:
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Hold the headers back until the first body chunk shows whether to compress.
+                    start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start_message is not None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                if "accept-encoding" not in headers.get("vary", "").lower():
+                    headers.add_vary_header("Accept-Encoding")
+                if encoding is None or (not more_body and len(body) < self.minimum_size):
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                headers["Content-Encoding"] = encoding
+                del headers["Content-Length"]
+                if not more_body:
+                    body = compress(body, encoding)
+                    headers["Content-Length"] = str(len(body))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+
+                compressor = _StreamCompressor(encoding)
+                await send(start_message)
+                start_message = None
+
+            chunk = compressor.compress(body)
+            if not more_body:
+                chunk += compressor.finish()
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -11,6 +11,28 @@ DB_USER = os.getenv("POSTGRES_USER", "linguaquiz_user")
 DB_PASSWORD = os.getenv("POSTGRES_PASSWORD", "password")
 DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "5"))
 DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "5"))
+DB_POOL_MAX_WAITING = int(os.getenv("DB_POOL_MAX_WAITING", "100"))
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "15000"))
+# Comma-separated host[:port] list of read replicas; empty keeps every query on the primary.
+DB_REPLICA_HOSTS = [host.strip() for host in os.getenv("DB_REPLICA_HOSTS", "").split(",") if host.strip()]
+# How long a client's reads stay on the primary after one of its own writes. The write time travels
+# in a cookie, so this holds across workers; cross-origin frontends must send credentials for it.
+DB_REPLICA_STICKY_SECONDS = float(os.getenv("DB_REPLICA_STICKY_SECONDS", "5"))
+DB_SLOW_QUERY_THRESHOLD_MS = float(os.getenv("DB_SLOW_QUERY_THRESHOLD_MS", "200"))
+DB_EXPLAIN_SLOW_QUERIES = os.getenv("DB_EXPLAIN_SLOW_QUERIES", "false").lower() == "true"
+DB_EXPLAIN_SAMPLE_RATE = float(os.getenv("DB_EXPLAIN_SAMPLE_RATE", "0.1"))
+
+# Content version cache configuration
+ACTIVE_VERSION_CACHE_TTL_SECONDS = float(os.getenv("ACTIVE_VERSION_CACHE_TTL_SECONDS", "300"))
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "64"))
+# Responses smaller than this are sent uncompressed.
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+# Progress delta sync only hands out watermarks this far behind NOW(): last_practiced_at is stamped at
+# transaction start, so a row can commit after newer rows have already been synced.
+PROGRESS_SYNC_SETTLE_SECONDS = float(os.getenv("PROGRESS_SYNC_SETTLE_SECONDS", "30"))
 
 # JWT configuration
 JWT_SECRET = os.getenv("JWT_SECRET")
@@ -18,10 +40,30 @@ if not JWT_SECRET:
     raise RuntimeError("JWT_SECRET environment variable must be set")
 JWT_ACCESS_TOKEN_EXPIRES_MINUTES = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRES_MINUTES", "15"))
 JWT_REFRESH_TOKEN_EXPIRES_DAYS = int(os.getenv("JWT_REFRESH_TOKEN_EXPIRES_DAYS", "7"))
+REFRESH_TOKEN_CLEANUP_INTERVAL_SECONDS = float(os.getenv("REFRESH_TOKEN_CLEANUP_INTERVAL_SECONDS", "3600"))
+REFRESH_TOKEN_CLEANUP_BATCH_SIZE = int(os.getenv("REFRESH_TOKEN_CLEANUP_BATCH_SIZE", "1000"))
+# Revoked tokens are kept this long before cleanup (useful when investigating token reuse).
+REFRESH_TOKEN_REVOKED_RETENTION_HOURS = float(os.getenv("REFRESH_TOKEN_REVOKED_RETENTION_HOURS", "24"))
+REJECTED_REFRESH_TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("REJECTED_REFRESH_TOKEN_CACHE_MAX_ENTRIES", "50000"))
 JWT_EXPIRES_IN = f"{JWT_ACCESS_TOKEN_EXPIRES_MINUTES}m"
 
+# Password hashing configuration
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS = float(os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS", "5"))
+
+# TTS cache configuration
+TTS_MEMORY_CACHE_MAX_BYTES = int(os.getenv("TTS_MEMORY_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+TTS_ACCESS_FLUSH_INTERVAL_SECONDS = float(os.getenv("TTS_ACCESS_FLUSH_INTERVAL_SECONDS", "30"))
+TTS_EVICTION_INTERVAL_SECONDS = float(os.getenv("TTS_EVICTION_INTERVAL_SECONDS", "3600"))
+TTS_EVICTION_BATCH_SIZE = int(os.getenv("TTS_EVICTION_BATCH_SIZE", "1000"))
+
 # Server configuration
 PORT = int(os.getenv("PORT", 9000))
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+# Internal port of the Prometheus exporter (metrics_exporter.py); keep it off the public ingress.
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9100"))
 
 # CORS configuration
 CORS_ALLOWED_ORIGINS = os.getenv(
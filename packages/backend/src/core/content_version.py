@@ -0,0 +1,64 @@
+import asyncio
+import logging
+import time
+
+from core.config import ACTIVE_VERSION_CACHE_TTL_SECONDS
+from core.database import async_query_db
+from core.notifications import notification_listener
+
+logger = logging.getLogger(__name__)
+
+CONTENT_VERSION_CHANNEL = "content_version_changed"
+
+
+class ActiveVersionCache:
+    """Per-worker cache of get_active_version_id().
+
+    Entries are dropped when Postgres sends a NOTIFY on CONTENT_VERSION_CHANNEL (fired by a
+    trigger on content_versions) and, as a fallback for missed notifications, after ttl seconds.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._version_id: int | None = None
+        self._expires_at = 0.0
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self):
+        self._version_id = None
+        self._expires_at = 0.0
+        self._generation += 1
+
+    async def get(self) -> int | None:
+        if self._version_id is not None and time.monotonic() < self._expires_at:
+            return self._version_id
+
+        async with self._lock:
+            if self._version_id is not None and time.monotonic() < self._expires_at:
+                return self._version_id
+
+            generation = self._generation
+            # Primary: right after a NOTIFY a lagging replica may still report the old version.
+            row = await async_query_db("SELECT get_active_version_id()", one=True, primary=True)
+            version_id = row["get_active_version_id"] if row else None
+            # Don't store a value that was invalidated while the query was in flight.
+            if version_id is not None and generation == self._generation:
+                self._version_id = version_id
+                self._expires_at = time.monotonic() + self.ttl
+            return version_id
+
+
+active_version_cache = ActiveVersionCache(ACTIVE_VERSION_CACHE_TTL_SECONDS)
+
+
+def _on_content_version_changed(_payload: str):
+    logger.info("Content version changed, invalidating cached active version")
+    active_version_cache.invalidate()
+
+
+notification_listener.register(CONTENT_VERSION_CHANNEL, _on_content_version_changed, active_version_cache.invalidate)
+
+
+async def get_active_version_id() -> int | None:
+    return await active_version_cache.get()
@@ -1,123 +1,302 @@
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+import itertools
 import logging
+import random
+import time
 
 from core.config import (
+    DB_EXPLAIN_SAMPLE_RATE,
+    DB_EXPLAIN_SLOW_QUERIES,
     DB_HOST,
     DB_NAME,
     DB_PASSWORD,
     DB_POOL_MAX_SIZE,
+    DB_POOL_MAX_WAITING,
     DB_POOL_MIN_SIZE,
+    DB_POOL_TIMEOUT_SECONDS,
     DB_PORT,
+    DB_REPLICA_HOSTS,
+    DB_REPLICA_STICKY_SECONDS,
+    DB_SLOW_QUERY_THRESHOLD_MS,
+    DB_STATEMENT_TIMEOUT_MS,
     DB_USER,
 )
-import psycopg2
-from psycopg2.extras import RealDictCursor
-from psycopg2.pool import SimpleConnectionPool
+from core.metrics import (
+    DB_POOL_ACQUIRE_DURATION,
+    DB_QUERY_DURATION,
+    DB_QUERY_ROWS,
+    DB_SLOW_QUERIES,
+    PoolStatsRecorder,
+    describe_params,
+    normalize_sql,
+    statement_fingerprint,
+)
+from fastapi import HTTPException, status
+from psycopg.conninfo import make_conninfo
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool, PoolTimeout, TooManyRequests
 
 logger = logging.getLogger(__name__)
 
-db_pool = SimpleConnectionPool(
-    DB_POOL_MIN_SIZE,
-    DB_POOL_MAX_SIZE,
-    host=DB_HOST,
-    port=DB_PORT,
-    database=DB_NAME,
-    user=DB_USER,
-    password=DB_PASSWORD,
-)
+DB_CONNINFO = make_conninfo(host=DB_HOST, port=DB_PORT, dbname=DB_NAME, user=DB_USER, password=DB_PASSWORD)
 
 
-def get_db():
-    return db_pool.getconn()
+def _make_pool(name, conninfo):
+    return AsyncConnectionPool(
+        conninfo=conninfo,
+        name=name,
+        min_size=DB_POOL_MIN_SIZE,
+        max_size=DB_POOL_MAX_SIZE,
+        kwargs={"row_factory": dict_row, "options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"},
+        timeout=DB_POOL_TIMEOUT_SECONDS,
+        max_waiting=DB_POOL_MAX_WAITING,
+        # Validate idle connections on checkout so a server restart doesn't surface as request errors.
+        check=AsyncConnectionPool.check_connection,
+        open=False,
+    )
 
 
-def put_db(conn):
-    db_pool.putconn(conn)
+def _replica_conninfo(replica):
+    host, _, port = replica.partition(":")
+    return make_conninfo(host=host, port=int(port or DB_PORT), dbname=DB_NAME, user=DB_USER, password=DB_PASSWORD)
 
 
-def query_db(query, args=(), one=False):
-    query_upper = query.strip().upper()
-    write_keywords = ["INSERT", "UPDATE", "DELETE", "CREATE", "DROP", "ALTER", "TRUNCATE"]
+async_pool = _make_pool("primary", DB_CONNINFO)
+replica_pools = [_make_pool(f"replica-{i}", _replica_conninfo(replica)) for i, replica in enumerate(DB_REPLICA_HOSTS)]
+_replica_cycle = itertools.cycle(replica_pools)
+pool_stats_recorder = PoolStatsRecorder([async_pool, *replica_pools])
+
+
+class WriteMarker:
+    """Read-your-writes state of one request: when its client last wrote, and whether it writes now.
+
+    ReadYourWritesMiddleware creates one per request from the client's cookie, so the state
+    follows the client across workers instead of living in one worker's memory.
+    """
+
+    def __init__(self, last_write: float | None = None):
+        self.last_write = last_write
+        self.wrote = False
 
-    for keyword in write_keywords:
+
+current_write_marker: ContextVar[WriteMarker | None] = ContextVar("current_write_marker", default=None)
+
+WRITE_KEYWORDS = ["INSERT", "UPDATE", "DELETE", "CREATE", "DROP", "ALTER", "TRUNCATE"]
+
+
+def _ensure_read_only(query, caller):
+    query_upper = query.strip().upper()
+    writer = caller.replace("query_db", "execute_write_transaction")
+    for keyword in WRITE_KEYWORDS:
         if query_upper.startswith(keyword):
-            raise ValueError(f"query_db() detected a write operation starting with '{keyword}'. Use execute_write_transaction() instead.")
+            raise ValueError(f"{caller}() detected a write operation starting with '{keyword}'. Use {writer}() instead.")
+
+
+# Strong references to in-flight EXPLAIN tasks so they are not garbage collected.
+_explain_tasks: set[asyncio.Task] = set()
+
+
+def _record_statement(query, args, elapsed, rowcount, explain=False):
+    """Time/row-count metrics for every statement, plus slow-query logging and EXPLAIN sampling."""
+    fingerprint = statement_fingerprint(query)
+    DB_QUERY_DURATION.labels(fingerprint).observe(elapsed)
+    if rowcount >= 0:
+        DB_QUERY_ROWS.labels(fingerprint).observe(rowcount)
+
+    elapsed_ms = elapsed * 1000
+    if DB_SLOW_QUERY_THRESHOLD_MS <= 0 or elapsed_ms < DB_SLOW_QUERY_THRESHOLD_MS:
+        return
+
+    DB_SLOW_QUERIES.labels(fingerprint).inc()
+    logger.warning(f"Slow query [{fingerprint}] {elapsed_ms:.1f} ms, {rowcount} rows: {normalize_sql(query)} params={describe_params(args)}")
+
+    if explain and DB_EXPLAIN_SLOW_QUERIES and _can_explain(query) and random.random() < DB_EXPLAIN_SAMPLE_RATE:
+        task = asyncio.get_running_loop().create_task(_explain_slow_query(query, args, fingerprint))
+        _explain_tasks.add(task)
+        task.add_done_callback(_explain_tasks.discard)
+
+
+def _can_explain(query):
+    # EXPLAIN ANALYZE executes the statement, so only ever sample plain reads.
+    words = normalize_sql(query).upper().replace("(", " ").split()
+    return bool(words) and words[0] != "EXPLAIN" and not set(words).intersection(WRITE_KEYWORDS)
+
+
+async def _explain_slow_query(query, args, fingerprint):
+    try:
+        async with async_pool.connection() as conn:
+            await conn.execute("SET TRANSACTION READ ONLY")
+            async with conn.cursor() as cur:
+                await cur.execute(f"EXPLAIN (ANALYZE, BUFFERS) {query}", args)
+                plan = "\n".join(row["QUERY PLAN"] for row in await cur.fetchall())
+            await conn.rollback()
+        logger.warning(f"Plan for slow query [{fingerprint}]:\n{plan}")
+    except Exception as e:
+        logger.warning(f"Failed to EXPLAIN slow query [{fingerprint}]: {e}")
+
+
+async def open_async_pool():
+    await async_pool.open(wait=False)
+    logger.info(
+        f"Async database pool opened (min={DB_POOL_MIN_SIZE}, max={DB_POOL_MAX_SIZE}, "
+        f"timeout={DB_POOL_TIMEOUT_SECONDS}s, max_waiting={DB_POOL_MAX_WAITING}, statement_timeout={DB_STATEMENT_TIMEOUT_MS}ms)"
+    )
+    for pool in replica_pools:
+        await pool.open(wait=False)
+    if replica_pools:
+        logger.info(f"Routing reads to {len(replica_pools)} replica(s): {', '.join(DB_REPLICA_HOSTS)}")
+
+
+async def close_async_pool():
+    for pool in replica_pools:
+        await pool.close()
+    await async_pool.close()
+    logger.info("Async database pool closed")
+
+
+def _note_write():
+    marker = current_write_marker.get()
+    if marker is None or not replica_pools:
+        return
+    marker.last_write = time.time()
+    marker.wrote = True
+
+
+def _read_pool(primary=False):
+    """Pool to serve a read from: a replica (round robin) unless routing is off or the client wrote recently."""
+    if primary or not replica_pools:
+        return async_pool
+    marker = current_write_marker.get()
+    if marker is not None and marker.last_write is not None and time.time() - marker.last_write < DB_REPLICA_STICKY_SECONDS:
+        return async_pool
+    return next(_replica_cycle)
+
 
-    conn = None
+@asynccontextmanager
+async def _pooled_connection(pool=None):
+    """Borrow a connection like pool.connection(), shedding load with a 503 when the pool is saturated."""
+    pool = pool or async_pool
+    started = time.perf_counter()
     try:
-        conn = get_db()
-        if not conn:
-            raise Exception("Failed to get database connection")
+        conn = await pool.getconn()
+    except (PoolTimeout, TooManyRequests) as e:
+        logger.warning(f"Database pool '{pool.name}' saturated: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    DB_POOL_ACQUIRE_DURATION.labels(pool.name).observe(time.perf_counter() - started)
 
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(query, args)
-            rv = cur.fetchall()
+    try:
+        # Commits on success and rolls back on error; pooled connections are not closed.
+        async with conn:
+            yield conn
+    finally:
+        await pool.putconn(conn)
+
+
+async def get_async_db():
+    """FastAPI dependency yielding one pooled connection for the lifetime of a request."""
+    async with _pooled_connection() as conn:
+        yield conn
+
+
+async def get_async_read_db():
+    """Like get_async_db, but on a read replica when replica routing allows it (see async_query_db)."""
+    async with _pooled_connection(_read_pool()) as conn:
+        yield conn
+
+
+async def get_async_transaction():
+    """FastAPI dependency yielding one pooled connection inside a single transaction.
+
+    Every statement run with conn= shares the checkout and the transaction, which commits when
+    the handler returns and rolls back if it raises. Declare it with scope="function" so the
+    commit happens before the response is sent:
+
+        conn=Depends(get_async_transaction, scope="function")
+    """
+    async with _pooled_connection() as conn, conn.transaction():
+        yield conn
+
+
+async def _run_query(conn, query, args, one):
+    started = time.perf_counter()
+    rowcount = -1
+    try:
+        async with conn.cursor() as cur:
+            await cur.execute(query, args)
+            rv = await cur.fetchall()
+            rowcount = len(rv)
             return (rv[0] if rv else None) if one else rv
+    finally:
+        _record_statement(query, args, time.perf_counter() - started, rowcount, explain=True)
 
-    except psycopg2.pool.PoolError as e:
-        logger.error(f"Connection pool error: {e}")
-        if conn:
-            try:
-                conn.rollback()
-            except Exception:
-                pass
+
+async def _run_write(conn, query, args, fetch_results, one):
+    started = time.perf_counter()
+    rowcount = -1
+    try:
+        async with conn.cursor() as cur:
+            await cur.execute(query, args)
+            rowcount = cur.rowcount
+            if fetch_results:
+                rv = await cur.fetchall()
+                return (rv[0] if rv else None) if one else rv
+            return cur.rowcount
+    finally:
+        _record_statement(query, args, time.perf_counter() - started, rowcount)
+
+
+async def async_query_db(query, args=(), one=False, conn=None, *, primary=False):
+    """Run a read-only statement and return its rows (or the first row with one=True).
+
+    Runs on the given connection when one is passed (e.g. from get_async_db), otherwise
+    borrows a connection for the duration of the statement: from a read replica when
+    DB_REPLICA_HOSTS is set, unless primary=True or the client wrote within the last
+    DB_REPLICA_STICKY_SECONDS (see ReadYourWritesMiddleware).
+    """
+    _ensure_read_only(query, "async_query_db")
+
+    try:
+        if conn is not None:
+            return await _run_query(conn, query, args, one)
+
+        async with _pooled_connection(_read_pool(primary)) as pooled_conn:
+            return await _run_query(pooled_conn, query, args, one)
+
+    except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Database query error: {e}")
-        if conn:
-            try:
-                conn.rollback()
-            except Exception:
-                pass
         raise
-    finally:
-        if conn:
-            try:
-                put_db(conn)
-            except Exception as e:
-                logger.critical(f"Failed to return connection to pool: {e}")
-                try:
-                    conn.close()
-                except Exception:
-                    pass
-
-
-def execute_write_transaction(query, args=(), fetch_results=False, one=False):
-    conn = None
-    try:
-        conn = get_db()
-        if not conn:
-            raise Exception("Failed to get database connection")
 
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(query, args)
 
-            if fetch_results:
-                rv = cur.fetchall()
-                conn.commit()
-                return (rv[0] if rv else None) if one else rv
+async def async_estimate_count(query, args=(), conn=None) -> int:
+    """Planner row estimate for a SELECT, for totals where an exact COUNT(*) would scan too much."""
+    row = await async_query_db(f"EXPLAIN (FORMAT JSON) {query}", args, one=True, conn=conn)
+    return int(row["QUERY PLAN"][0]["Plan"]["Plan Rows"])
+
 
-            row_count = cur.rowcount
-            conn.commit()
-            return row_count
+async def async_execute_write_transaction(query, args=(), fetch_results=False, one=False, conn=None):
+    """Run a write statement and return its row count (or rows with fetch_results=True).
 
-    except psycopg2.pool.PoolError as e:
-        logger.error(f"Connection pool error: {e}")
+    Without a connection the statement runs in its own transaction and is committed
+    immediately. With a connection, transaction control is left to its owner.
+    """
+    _note_write()
+    try:
+        if conn is not None:
+            return await _run_write(conn, query, args, fetch_results, one)
+
+        async with _pooled_connection() as pooled_conn:
+            return await _run_write(pooled_conn, query, args, fetch_results, one)
+
+    except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Database execute error: {e}")
-        if conn:
-            try:
-                conn.rollback()
-            except Exception:
-                pass
         raise
-    finally:
-        if conn:
-            try:
-                put_db(conn)
-            except Exception as e:
-                logger.critical(f"Failed to return connection to pool: {e}")
-                try:
-                    conn.close()
-                except Exception:
-                    pass
@@ -0,0 +1,160 @@
+import asyncio
+from functools import lru_cache
+import hashlib
+import logging
+import os
+import re
+
+from prometheus_client import Counter, Gauge, Histogram, multiprocess
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge("http_requests_in_progress", "HTTP requests currently being served", ["method"], multiprocess_mode="livesum")
+
+DB_POOL_ACQUIRE_DURATION = Histogram(
+    "db_pool_acquire_duration_seconds",
+    "Time spent waiting for a connection from an async pool",
+    ["pool"],
+    buckets=QUERY_BUCKETS,
+)
+POOL_STATS_INTERVAL_SECONDS = 5.0
+DB_POOL_MAX_SIZE = Gauge("db_pool_max_size", "Maximum number of connections in the pool", ["pool"], multiprocess_mode="livesum")
+DB_POOL_SIZE = Gauge("db_pool_size", "Connections currently open (in use or idle)", ["pool"], multiprocess_mode="livesum")
+DB_POOL_IN_USE = Gauge("db_pool_in_use", "Connections currently checked out", ["pool"], multiprocess_mode="livesum")
+DB_POOL_WAITING = Gauge("db_pool_waiting", "Requests waiting for a connection", ["pool"], multiprocess_mode="livesum")
+DB_POOL_REQUESTS = Counter("db_pool_requests", "Connection requests served by the pool", ["pool"])
+DB_POOL_REQUESTS_QUEUED = Counter("db_pool_requests_queued", "Connection requests that had to wait for a connection", ["pool"])
+DB_POOL_WAIT_SECONDS = Counter("db_pool_wait_seconds", "Total time requests spent waiting for a connection", ["pool"])
+DB_POOL_REQUEST_ERRORS = Counter("db_pool_request_errors", "Connection requests that failed (timeout or queue full)", ["pool"])
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement duration by statement fingerprint",
+    ["statement"],
+    buckets=QUERY_BUCKETS,
+)
+DB_QUERY_ROWS = Histogram(
+    "db_query_rows",
+    "Rows returned or affected per SQL statement",
+    ["statement"],
+    buckets=(0, 1, 10, 100, 1000, 10000, 100000),
+)
+DB_SLOW_QUERIES = Counter("db_slow_queries_total", "Statements slower than DB_SLOW_QUERY_THRESHOLD_MS", ["statement"])
+
+TTS_CACHE_REQUESTS = Counter("tts_cache_requests_total", "TTS cache lookups by tier and result", ["tier", "result"])
+TTS_UPSTREAM_DURATION = Histogram(
+    "tts_upstream_duration_seconds",
+    "Google Text-to-Speech synthesis latency",
+    ["outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+
+_STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDER_RE = re.compile(r"%\(\w+\)s|%s")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE_RE = re.compile(r"\s+")
+_TABLE_RE = re.compile(r"\b(?:FROM|INTO|UPDATE|JOIN)\s+([a-z_][a-z0-9_]*)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(query: str) -> str:
+    """Collapse whitespace and replace literals and placeholders with '?'."""
+    normalized = _STRING_LITERAL_RE.sub("?", query)
+    normalized = _PLACEHOLDER_RE.sub("?", normalized)
+    normalized = _NUMBER_RE.sub("?", normalized)
+    return _WHITESPACE_RE.sub(" ", normalized).strip()
+
+
+@lru_cache(maxsize=1024)
+def statement_fingerprint(query: str) -> str:
+    """Short, stable label for a statement, e.g. 'SELECT user_progress 3f2a1c9b'."""
+    normalized = normalize_sql(query)
+    verb = normalized.split(" ", 1)[0].upper()
+    table = _TABLE_RE.search(normalized)
+    digest = hashlib.sha1(normalized.encode()).hexdigest()[:8]
+    return f"{verb} {table.group(1) if table else '-'} {digest}"
+
+
+def describe_params(args) -> str:
+    """Shape of bind parameters (types, lengths) without their values, for logging."""
+    if isinstance(args, dict):
+        return "{" + ", ".join(f"{key}: {_param_shape(value)}" for key, value in args.items()) + "}"
+    return "(" + ", ".join(_param_shape(value) for value in args or ()) + ")"
+
+
+def _param_shape(value) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, (list, tuple, str, bytes)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+class PoolStatsRecorder:
+    """Copies psycopg_pool statistics into the DB_POOL_* metrics at a fixed interval.
+
+    Pool stats only exist in the worker that owns the pool, so they are written into regular
+    metrics (which multiprocess mode aggregates across workers) instead of read at scrape time.
+    """
+
+    def __init__(self, pools, interval: float = POOL_STATS_INTERVAL_SECONDS):
+        self.pools = pools
+        self.interval = interval
+        self._seen: dict[tuple[str, str], float] = {}
+        self._task: asyncio.Task | None = None
+
+    def record(self):
+        for pool in self.pools:
+            stats = pool.get_stats()
+            size = stats.get("pool_size", 0)
+            DB_POOL_MAX_SIZE.labels(pool.name).set(stats.get("pool_max", 0))
+            DB_POOL_SIZE.labels(pool.name).set(size)
+            DB_POOL_IN_USE.labels(pool.name).set(size - stats.get("pool_available", 0))
+            DB_POOL_WAITING.labels(pool.name).set(stats.get("requests_waiting", 0))
+            self._advance(DB_POOL_REQUESTS, pool.name, "requests_num", stats.get("requests_num", 0))
+            self._advance(DB_POOL_REQUESTS_QUEUED, pool.name, "requests_queued", stats.get("requests_queued", 0))
+            self._advance(DB_POOL_WAIT_SECONDS, pool.name, "requests_wait_ms", stats.get("requests_wait_ms", 0) / 1000)
+            self._advance(DB_POOL_REQUEST_ERRORS, pool.name, "requests_errors", stats.get("requests_errors", 0))
+
+    def _advance(self, counter, pool_name, stat, value):
+        # Pool counters are cumulative totals; Prometheus counters only move by increments.
+        key = (pool_name, stat)
+        delta = value - self._seen.get(key, 0)
+        if delta > 0:
+            counter.labels(pool_name).inc(delta)
+        self._seen[key] = value
+
+    async def _run(self):
+        while True:
+            try:
+                self.record()
+            except Exception as e:
+                logger.warning(f"Recording pool stats failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def mark_worker_dead(pid: int):
+    """Drop an exiting worker's live gauges from the multiprocess metrics directory."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
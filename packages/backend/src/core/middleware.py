@@ -0,0 +1,134 @@
+import math
+import time
+
+from core.config import DB_REPLICA_STICKY_SECONDS
+from core.database import WriteMarker, current_write_marker
+from core.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_PROGRESS
+from starlette.datastructures import MutableHeaders
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+SECURITY_HEADERS = {
+    "X-Frame-Options": "DENY",
+    "X-Content-Type-Options": "nosniff",
+    "Strict-Transport-Security": "max-age=31536000; includeSubDomains; preload",
+    "Cross-Origin-Embedder-Policy": "credentialless",
+    "Cross-Origin-Opener-Policy": "same-origin",
+    "Permissions-Policy": "geolocation=(), microphone=(), camera=(), payment=(), usb=(), magnetometer=(), gyroscope=(), accelerometer=()",
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+}
+# Applied to /api/ responses that don't set their own Cache-Control.
+NO_STORE_HEADERS = {
+    "Cache-Control": "no-cache, no-store, must-revalidate",
+    "Pragma": "no-cache",
+    "Expires": "0",
+}
+# Cookie carrying the epoch time of the client's last database write (see ReadYourWritesMiddleware).
+LAST_WRITE_COOKIE = "lq_last_write"
+
+
+class SecurityHeadersMiddleware:
+    """Adds security headers (and no-store caching for API responses) to http.response.start.
+
+    Pure ASGI, so unlike @app.middleware("http") it adds no extra task or body stream per request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        is_api = scope["path"].startswith("/api/")
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in SECURITY_HEADERS.items():
+                    headers[name] = value
+                if is_api and "cache-control" not in headers:
+                    for name, value in NO_STORE_HEADERS.items():
+                        headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class RequestMetricsMiddleware:
+    """Records request latency by route template and in-flight requests by method."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Label by route template, not raw path, to keep cardinality bounded. The router
+            # stores the matched route in the shared scope.
+            route = scope.get("route")
+            route_path = route.path if route is not None else "unmatched"
+            HTTP_REQUEST_DURATION.labels(method, route_path, str(status_code)).observe(time.perf_counter() - started)
+            in_progress.dec()
+
+
+class ReadYourWritesMiddleware:
+    """Keeps a client's reads on the primary for DB_REPLICA_STICKY_SECONDS after its own writes.
+
+    The time of the client's last write comes in, and goes back out, as a cookie, so any worker
+    can honour it. Only needed when read replicas are configured.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        marker = WriteMarker(_last_write_from_cookie(scope))
+        token = current_write_marker.set(marker)
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start" and marker.wrote:
+                MutableHeaders(scope=message).append(
+                    "Set-Cookie",
+                    f"{LAST_WRITE_COOKIE}={marker.last_write:.3f}; Max-Age={math.ceil(DB_REPLICA_STICKY_SECONDS)}; Path=/api; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_write_marker.reset(token)
+
+
+def _last_write_from_cookie(scope: Scope) -> float | None:
+    for name, value in scope["headers"]:
+        if name == b"cookie":
+            raw = cookie_parser(value.decode("latin-1")).get(LAST_WRITE_COOKIE)
+            try:
+                last_write = float(raw) if raw else None
+            except ValueError:
+                return None
+            return last_write if last_write is not None and math.isfinite(last_write) else None
+    return None
@@ -0,0 +1,68 @@
+import asyncio
+from collections.abc import Callable
+import logging
+
+from core.database import DB_CONNINFO
+import psycopg
+
+logger = logging.getLogger(__name__)
+
+LISTENER_RETRY_SECONDS = 5.0
+
+
+class NotificationListener:
+    """One dedicated LISTEN connection per worker, dispatching NOTIFY payloads by channel.
+
+    Each registered channel has a handler called with the payload of every notification, and a
+    reset callback called whenever notifications may have been missed: on (re)connect and after
+    a connection error.
+    """
+
+    def __init__(self):
+        self._handlers: dict[str, tuple[Callable[[str], None], Callable[[], None]]] = {}
+        self._task: asyncio.Task | None = None
+
+    def register(self, channel: str, on_notify: Callable[[str], None], on_reset: Callable[[], None]):
+        if self._task is not None:
+            raise RuntimeError("Register notification channels before starting the listener")
+        self._handlers[channel] = (on_notify, on_reset)
+
+    def _reset_all(self):
+        for _, on_reset in self._handlers.values():
+            on_reset()
+
+    async def _listen(self):
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(DB_CONNINFO, autocommit=True) as conn:
+                    for channel in self._handlers:
+                        await conn.execute(f"LISTEN {channel}")
+                    # Anything may have changed while we were not listening.
+                    self._reset_all()
+                    logger.info(f"Listening for notifications on {', '.join(self._handlers)}")
+                    async for notify in conn.notifies():
+                        handler = self._handlers.get(notify.channel)
+                        if handler is not None:
+                            handler[0](notify.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Notification listener error: {e}. Retrying in {LISTENER_RETRY_SECONDS}s")
+                self._reset_all()
+                await asyncio.sleep(LISTENER_RETRY_SECONDS)
+
+    def start(self):
+        if self._task is None and self._handlers:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+notification_listener = NotificationListener()
@@ -0,0 +1,116 @@
+import asyncio
+from collections import OrderedDict
+import logging
+
+from core.config import (
+    REFRESH_TOKEN_CLEANUP_BATCH_SIZE,
+    REFRESH_TOKEN_CLEANUP_INTERVAL_SECONDS,
+    REFRESH_TOKEN_REVOKED_RETENTION_HOURS,
+    REJECTED_REFRESH_TOKEN_CACHE_MAX_ENTRIES,
+)
+from core.database import async_execute_write_transaction
+
+logger = logging.getLogger(__name__)
+
+
+class RejectedTokenCache:
+    """Per-worker LRU of refresh-token hashes known to be revoked, expired or unknown.
+
+    A rejected token can never become valid again, so entries need no TTL and a hit lets a
+    refresh storm of stale tokens be answered without a database lookup. The cache only ever
+    short-circuits rejections; valid tokens are always checked against the database.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, str] = OrderedDict()
+
+    def get(self, token_hash: str) -> str | None:
+        reason = self._entries.get(token_hash)
+        if reason is not None:
+            self._entries.move_to_end(token_hash)
+        return reason
+
+    def add(self, token_hash: str, reason: str):
+        self._entries[token_hash] = reason
+        self._entries.move_to_end(token_hash)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+rejected_token_cache = RejectedTokenCache(REJECTED_REFRESH_TOKEN_CACHE_MAX_ENTRIES)
+
+
+async def purge_refresh_tokens(batch_size: int) -> int:
+    """Delete one batch of expired tokens and revoked tokens past their retention; returns rows deleted.
+
+    SKIP LOCKED lets several workers run the job at once without blocking each other.
+    """
+    expired = await async_execute_write_transaction(
+        """DELETE FROM refresh_tokens
+           WHERE id IN (
+               SELECT id FROM refresh_tokens
+               WHERE expires_at < NOW()
+               LIMIT %s
+               FOR UPDATE SKIP LOCKED
+           )""",
+        (batch_size,),
+    )
+    revoked = await async_execute_write_transaction(
+        """DELETE FROM refresh_tokens
+           WHERE id IN (
+               SELECT id FROM refresh_tokens
+               WHERE revoked_at < NOW() - %s * INTERVAL '1 hour'
+               LIMIT %s
+               FOR UPDATE SKIP LOCKED
+           )""",
+        (REFRESH_TOKEN_REVOKED_RETENTION_HOURS, batch_size),
+    )
+    return expired + revoked
+
+
+class RefreshTokenCleanup:
+    """Background job that periodically purges refresh_tokens in bounded batches."""
+
+    def __init__(self, interval: float, batch_size: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: asyncio.Task | None = None
+
+    async def run_once(self) -> int:
+        total = 0
+        while True:
+            deleted = await purge_refresh_tokens(self.batch_size)
+            total += deleted
+            if deleted < self.batch_size:
+                return total
+            # Pause between batches so a large backlog doesn't hog pool connections.
+            await asyncio.sleep(0.1)
+
+    async def _run(self):
+        while True:
+            try:
+                deleted = await self.run_once()
+                if deleted:
+                    logger.info(f"Purged {deleted} expired or revoked refresh tokens")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Refresh token cleanup failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+refresh_token_cleanup = RefreshTokenCleanup(REFRESH_TOKEN_CLEANUP_INTERVAL_SECONDS, REFRESH_TOKEN_CLEANUP_BATCH_SIZE)
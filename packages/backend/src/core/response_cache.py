@@ -0,0 +1,91 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import hashlib
+import threading
+
+from core.compression import CACHED_LEVELS, SUPPORTED_ENCODINGS, compress, negotiate_encoding
+from core.config import COMPRESSION_MIN_SIZE, RESPONSE_CACHE_MAX_ENTRIES
+from core.database import async_query_db
+from fastapi import Request, Response, status
+import orjson
+
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+    # Pre-compressed bodies by content-coding; empty when the body is below the compression threshold.
+    encoded: dict[str, bytes] = field(default_factory=dict)
+
+
+class ResponseCache:
+    """LRU cache of serialized JSON bodies for content that only changes with the content version.
+
+    Keys must include everything the body depends on (typically the active version id and the
+    content changelog high-water mark), so entries never need explicit invalidation. Bodies of at
+    least compress_min_size bytes are also stored brotli- and gzip-compressed, so compression
+    costs are paid once per entry rather than per request.
+    """
+
+    def __init__(self, max_entries: int, compress_min_size: int):
+        self.max_entries = max_entries
+        self.compress_min_size = compress_min_size
+        self._entries: OrderedDict[tuple, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: tuple, payload) -> CachedResponse:
+        body = orjson.dumps(payload)
+        encoded = {}
+        if len(body) >= self.compress_min_size:
+            encoded = {encoding: compress(body, encoding, CACHED_LEVELS[encoding]) for encoding in SUPPORTED_ENCODINGS}
+        entry = CachedResponse(body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"', encoded=encoded)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+content_response_cache = ResponseCache(RESPONSE_CACHE_MAX_ENTRIES, COMPRESSION_MIN_SIZE)
+
+
+async def get_changelog_high_water_mark(conn=None) -> int:
+    row = await async_query_db("SELECT COALESCE(MAX(id), 0) AS hwm FROM content_changelog", one=True, conn=conn)
+    return row["hwm"]
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+def cached_json_response(request: Request, entry: CachedResponse) -> Response:
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    body = entry.encoded.get(encoding) if encoding else None
+    # Each content-coding is a distinct representation, so it gets its own strong validator.
+    etag = f'{entry.etag[:-1]}-{encoding}"' if body is not None else entry.etag
+    headers = {"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if body is not None:
+        headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="application/json", headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
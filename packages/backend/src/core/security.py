@@ -1,15 +1,29 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import datetime
 import hashlib
 import secrets
 
 import bcrypt
-from core.config import JWT_ACCESS_TOKEN_EXPIRES_MINUTES, JWT_REFRESH_TOKEN_EXPIRES_DAYS, JWT_SECRET
+from core.config import (
+    JWT_ACCESS_TOKEN_EXPIRES_MINUTES,
+    JWT_REFRESH_TOKEN_EXPIRES_DAYS,
+    JWT_SECRET,
+    PASSWORD_HASH_MAX_PENDING,
+    PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS,
+    PASSWORD_HASH_WORKERS,
+)
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 import jwt
 
 security = HTTPBearer()
 
+# bcrypt releases the GIL, so a small thread pool keeps hashing off the event loop. The
+# semaphore caps queued + running jobs so a login burst is shed instead of piling up.
+_password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+_password_slots = asyncio.Semaphore(PASSWORD_HASH_MAX_PENDING)
+
 
 def hash_password(password: str) -> str:
     return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
@@ -19,6 +33,30 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
 
 
+async def _run_password_job(func, *args):
+    try:
+        await asyncio.wait_for(_password_slots.acquire(), timeout=PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS)
+    except TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_password_executor, func, *args)
+    finally:
+        _password_slots.release()
+
+
+async def async_hash_password(password: str) -> str:
+    return await _run_password_job(hash_password, password)
+
+
+async def async_verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await _run_password_job(verify_password, plain_password, hashed_password)
+
+
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.datetime.utcnow() + datetime.timedelta(minutes=JWT_ACCESS_TOKEN_EXPIRES_MINUTES)
@@ -29,35 +67,56 @@ def create_access_token(data: dict) -> str:
 def create_refresh_token() -> tuple[str, str, datetime.datetime]:
     token = secrets.token_urlsafe(32)
     token_hash = hashlib.sha256(token.encode()).hexdigest()
-    expires_at = datetime.datetime.utcnow() + datetime.timedelta(days=JWT_REFRESH_TOKEN_EXPIRES_DAYS)
+    expires_at = datetime.datetime.now(datetime.UTC) + datetime.timedelta(days=JWT_REFRESH_TOKEN_EXPIRES_DAYS)
     return token, token_hash, expires_at
 
 
-def verify_refresh_token(token: str) -> dict:
-    from core.database import query_db
+async def consume_refresh_token(token: str, conn=None) -> dict:
+    """Verify a refresh token and revoke it in the same statement, for rotation.
+
+    Only the failure path needs a second lookup (to report why), and rejected hashes are
+    remembered so repeated attempts with the same stale token skip the database entirely.
+    """
+    from core.database import async_execute_write_transaction, async_query_db
+    from core.refresh_tokens import rejected_token_cache
 
     token_hash = hashlib.sha256(token.encode()).hexdigest()
 
-    token_data = query_db(
-        """
-        SELECT user_id, expires_at, revoked_at
-        FROM refresh_tokens
-        WHERE token_hash = %s
-        """,
+    reason = rejected_token_cache.get(token_hash)
+    if reason is not None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=reason)
+
+    # The revoked_at IS NULL guard also makes concurrent reuse of one token succeed only once.
+    token_data = await async_execute_write_transaction(
+        """UPDATE refresh_tokens SET revoked_at = NOW()
+           WHERE token_hash = %s AND revoked_at IS NULL AND expires_at > NOW()
+           RETURNING user_id""",
         (token_hash,),
+        fetch_results=True,
         one=True,
+        conn=conn,
     )
+    if token_data:
+        return {"user_id": token_data["user_id"]}
 
-    if not token_data:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
-
-    if token_data["revoked_at"] is not None:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token has been revoked")
-
-    if token_data["expires_at"] < datetime.datetime.utcnow():
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token has expired")
+    status_row = await async_query_db(
+        """SELECT revoked_at IS NOT NULL AS revoked, expires_at <= NOW() AS expired
+           FROM refresh_tokens
+           WHERE token_hash = %s""",
+        (token_hash,),
+        one=True,
+        conn=conn,
+        primary=True,
+    )
+    if not status_row:
+        reason = "Invalid refresh token"
+    elif status_row["revoked"]:
+        reason = "Refresh token has been revoked"
+    else:
+        reason = "Refresh token has expired"
 
-    return {"user_id": token_data["user_id"]}
+    rejected_token_cache.add(token_hash, reason)
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=reason)
 
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
@@ -82,13 +141,10 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
 
 
 async def require_admin(current_user: dict = Depends(get_current_user)) -> dict:
-    from core.database import query_db
+    from core.user_cache import user_cache
 
-    user = query_db(
-        "SELECT is_admin FROM users WHERE id = %s",
-        (current_user["user_id"],),
-        one=True,
-    )
+    # The token's isAdmin claim may be stale, so check the (cached) users row instead.
+    user = await user_cache.get(current_user["user_id"])
 
     if not user or not user.get("is_admin"):
         raise HTTPException(
@@ -0,0 +1,53 @@
+"""Server-side port of the queue rules implemented by QuizManager in packages/core.
+
+Constants mirror packages/core/src/constants.ts and must be kept in sync with it.
+"""
+
+from dataclasses import dataclass
+
+F = 5
+K = 2
+T_PROMO = 3
+MISTAKE_THRESHOLD = 3
+MISTAKE_WINDOW = 10
+MAX_FOCUS_POOL_SIZE = K * F * T_PROMO
+MIN_HISTORY_FOR_DEGRADATION = 3
+QUEUE_POSITION_INCREMENT = K * F
+
+MIN_LEVEL = 0
+MAX_LEVEL = 5
+
+# Word levels each practice level draws from, in priority order. LEVEL_1 additionally
+# tops up its focus pool with LEVEL_0 (and never-seen) words.
+PRACTICE_LEVEL_SOURCES = {
+    1: [1],
+    2: [2],
+    3: [3, 4, 5],
+    4: [3, 4, 5],
+}
+
+
+@dataclass
+class AnswerOutcome:
+    level: int
+    consecutive_correct: int
+    recent_history: list[bool]
+    # Index to re-insert the word at in its level queue; None means the end of the queue.
+    queue_offset: int | None
+
+
+def apply_answer(level: int, consecutive_correct: int, recent_history: list[bool], is_correct: bool) -> AnswerOutcome:
+    recent_history = [*recent_history[-(MISTAKE_WINDOW - 1) :], is_correct]
+    consecutive_correct = consecutive_correct + 1 if is_correct else 0
+    queue_offset = QUEUE_POSITION_INCREMENT * consecutive_correct if is_correct else F
+
+    if consecutive_correct >= T_PROMO:
+        if level < MAX_LEVEL:
+            return AnswerOutcome(level + 1, 0, recent_history, None)
+        return AnswerOutcome(level, consecutive_correct, recent_history, queue_offset)
+
+    mistakes = sum(1 for answer in recent_history if not answer)
+    if mistakes >= MISTAKE_THRESHOLD and len(recent_history) >= MIN_HISTORY_FOR_DEGRADATION and level > MIN_LEVEL:
+        return AnswerOutcome(level - 1, consecutive_correct, [], None)
+
+    return AnswerOutcome(level, consecutive_correct, recent_history, queue_offset)
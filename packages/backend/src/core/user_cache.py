@@ -0,0 +1,53 @@
+from collections import OrderedDict
+import time
+
+from core.config import USER_CACHE_MAX_ENTRIES, USER_CACHE_TTL_SECONDS
+from core.database import async_query_db
+from core.notifications import notification_listener
+
+USER_CHANGED_CHANNEL = "user_changed"
+
+
+class UserCache:
+    """Per-worker LRU cache of users rows (id, username, is_admin) keyed by user id.
+
+    Entries expire after ttl seconds and are dropped explicitly when Postgres sends a NOTIFY on
+    USER_CHANGED_CHANNEL (fired by a trigger when a user's username or admin flag changes, or the
+    user is deleted). Missing users are not cached.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[int, tuple[float, dict]] = OrderedDict()
+        self._generation = 0
+
+    def invalidate(self, user_id: int):
+        self._entries.pop(user_id, None)
+        self._generation += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._generation += 1
+
+    async def get(self, user_id: int) -> dict | None:
+        entry = self._entries.get(user_id)
+        if entry is not None:
+            expires_at, user = entry
+            if time.monotonic() < expires_at:
+                self._entries.move_to_end(user_id)
+                return user
+            del self._entries[user_id]
+
+        generation = self._generation
+        user = await async_query_db("SELECT id, username, is_admin FROM users WHERE id = %s", (user_id,), one=True, primary=True)
+        # Don't store a row that was invalidated while the query was in flight.
+        if user is not None and generation == self._generation:
+            self._entries[user_id] = (time.monotonic() + self.ttl, user)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return user
+
+
+user_cache = UserCache(USER_CACHE_TTL_SECONDS, USER_CACHE_MAX_ENTRIES)
+notification_listener.register(USER_CHANGED_CHANNEL, lambda payload: user_cache.invalidate(int(payload)), user_cache.clear)
@@ -0,0 +1,72 @@
+import re
+
+from core.database import async_query_db
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def build_tsquery(query: str, prefix: bool) -> str | None:
+    """Turn free text into a to_tsquery() expression ANDing its words.
+
+    With prefix=True the last word matches as a prefix ('hou' finds 'house'), for typeahead.
+    Only \\w characters survive, so the result never contains tsquery operators or quotes.
+    """
+    words = _WORD_RE.findall(query.lower())
+    if not words:
+        return None
+    terms = [f"'{word}'" for word in words]
+    if prefix:
+        terms[-1] += ":*"
+    return " & ".join(terms)
+
+
+async def search_vocabulary_items(
+    version_id: int,
+    query: str,
+    *,
+    columns: str,
+    limit: int,
+    prefix: bool = True,
+    source_language: str | None = None,
+    target_language: str | None = None,
+    include_inactive: bool = False,
+):
+    """Ranked search over one content version.
+
+    Candidates come from the trigram indexes (word similarity, tolerant to typos) and the
+    'simple' full-text indexes (whole words and prefixes); every predicate below matches an
+    index expression from the initial schema so the planner can BitmapOr them. Rows are ranked
+    by exact match first, then by trigram similarity plus full-text rank.
+    """
+    conditions = ["version_id = %(version_id)s"]
+    if not include_inactive:
+        conditions.append("is_active = TRUE")
+    if source_language:
+        conditions.append("source_language = %(source_language)s")
+    if target_language:
+        conditions.append("target_language = %(target_language)s")
+
+    return await async_query_db(
+        f"""SELECT {columns},
+                   GREATEST(word_similarity(%(query)s, source_text), word_similarity(%(query)s, target_text))
+                   + COALESCE(GREATEST(ts_rank(to_tsvector('simple', source_text), tsq),
+                                       ts_rank(to_tsvector('simple', target_text), tsq)), 0) AS score
+            FROM vocabulary_items, to_tsquery('simple', %(tsquery)s) AS tsq
+            WHERE {" AND ".join(conditions)}
+              AND (%(query)s <%% source_text
+                   OR %(query)s <%% target_text
+                   OR to_tsvector('simple', source_text) @@ tsq
+                   OR to_tsvector('simple', target_text) @@ tsq)
+            ORDER BY is_active DESC,
+                     (lower(source_text) = lower(%(query)s) OR lower(target_text) = lower(%(query)s)) DESC,
+                     score DESC, source_text, id
+            LIMIT %(limit)s""",
+        {
+            "version_id": version_id,
+            "query": query,
+            "tsquery": build_tsquery(query, prefix),
+            "source_language": source_language,
+            "target_language": target_language,
+            "limit": limit,
+        },
+    )
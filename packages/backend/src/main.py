@@ -1,11 +1,18 @@
 #!/usr/bin/env python3
+from contextlib import asynccontextmanager
 import datetime
 import logging
+import os
 
 from api.v2 import admin, auth, progress, tts, version, vocabulary
-from core.config import CORS_ALLOWED_ORIGINS, PORT
-from core.database import query_db
-from fastapi import FastAPI, HTTPException, Request, status
+from core.compression import CompressionMiddleware
+from core.config import COMPRESSION_MIN_SIZE, CORS_ALLOWED_ORIGINS, DB_REPLICA_HOSTS, PORT
+from core.database import async_query_db, close_async_pool, get_async_db, open_async_pool, pool_stats_recorder
+from core.metrics import mark_worker_dead
+from core.middleware import ReadYourWritesMiddleware, RequestMetricsMiddleware, SecurityHeadersMiddleware
+from core.notifications import notification_listener
+from core.refresh_tokens import refresh_token_cleanup
+from fastapi import Depends, FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import ValidationError
@@ -13,16 +20,38 @@ from schemas.health import HealthResponse, VersionResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
+from tts_service import init_tts_service
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await open_async_pool()
+    pool_stats_recorder.start()
+    notification_listener.start()
+    refresh_token_cleanup.start()
+    tts_service = init_tts_service()
+    tts_service.start_background_tasks()
+    try:
+        yield
+    finally:
+        await tts_service.stop_background_tasks()
+        await refresh_token_cleanup.stop()
+        await notification_listener.stop()
+        await pool_stats_recorder.stop()
+        await close_async_pool()
+        mark_worker_dead(os.getpid())
+
+
 app = FastAPI(
     title="LinguaQuiz API",
     description="Language learning quiz backend with automated spaced repetition",
     version="4.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -32,24 +61,11 @@ app.add_middleware(
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
 )
-
-
-@app.middleware("http")
-async def add_security_headers(request: Request, call_next):
-    response = await call_next(request)
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains; preload"
-    response.headers["Cross-Origin-Embedder-Policy"] = "credentialless"
-    response.headers["Cross-Origin-Opener-Policy"] = "same-origin"
-    permissions_policy = "geolocation=(), microphone=(), camera=(), payment=(), usb=(), magnetometer=(), gyroscope=(), accelerometer=()"
-    response.headers["Permissions-Policy"] = permissions_policy
-    response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-    if request.url.path.startswith("/api/"):
-        response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-        response.headers["Pragma"] = "no-cache"
-        response.headers["Expires"] = "0"
-    return response
+app.add_middleware(CompressionMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
+if DB_REPLICA_HOSTS:
+    app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(RequestMetricsMiddleware)
+app.add_middleware(SecurityHeadersMiddleware)
 
 
 limiter = Limiter(key_func=get_remote_address)
@@ -65,9 +81,9 @@ app.include_router(version.router)
 
 
 @app.get("/api/health", response_model=HealthResponse, tags=["Health"])
-async def health_check():
+async def health_check(conn=Depends(get_async_db)):
     try:
-        query_db("SELECT 1", one=True)
+        await async_query_db("SELECT 1", one=True, conn=conn)
         return HealthResponse(
             status="ok",
             database="connected",
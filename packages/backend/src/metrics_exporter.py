@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Prometheus exporter for the API workers.
+
+Each uvicorn worker writes its metrics to PROMETHEUS_MULTIPROC_DIR; this process merges
+them and serves the result on METRICS_PORT. The port is internal: only the metrics
+scraper should reach it, never the public ingress. start.sh runs it next to uvicorn.
+"""
+
+import logging
+import threading
+
+from core.config import METRICS_PORT
+from prometheus_client import CollectorRegistry, start_http_server
+from prometheus_client.multiprocess import MultiProcessCollector
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry)
+    start_http_server(METRICS_PORT, registry=registry)
+    logger.info(f"Serving worker metrics on port {METRICS_PORT}")
+    threading.Event().wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,33 @@
 from .health import HealthResponse, VersionResponse
-from .progress import ProgressUpdateRequest, UserProgressResponse
-from .tts import TTSLanguagesResponse, TTSRequest, TTSResponse
+from .progress import (
+    PracticeAnswerRequest,
+    PracticeAnswerResponse,
+    PracticeItemResponse,
+    ProgressBatchFailure,
+    ProgressBatchRequest,
+    ProgressBatchResponse,
+    ProgressSyncResponse,
+    ProgressUpdateRequest,
+    UserProgressResponse,
+)
+from .tts import TTSAudioResponse, TTSCacheStatsResponse, TTSLanguagesResponse, TTSRequest, TTSResponse
 from .user import TokenResponse, UserLogin, UserRegistration, UserResponse
 from .version import ContentVersionResponse
-from .vocabulary import VocabularyItemResponse, WordListResponse
+from .vocabulary import VocabularyItemResponse, VocabularySearchResultResponse, WordListResponse
 
 __all__ = [
     "ContentVersionResponse",
     "HealthResponse",
+    "PracticeAnswerRequest",
+    "PracticeAnswerResponse",
+    "PracticeItemResponse",
+    "ProgressBatchFailure",
+    "ProgressBatchRequest",
+    "ProgressBatchResponse",
+    "ProgressSyncResponse",
     "ProgressUpdateRequest",
+    "TTSAudioResponse",
+    "TTSCacheStatsResponse",
     "TTSLanguagesResponse",
     "TTSRequest",
     "TTSResponse",
@@ -19,5 +38,6 @@ __all__ = [
     "UserResponse",
     "VersionResponse",
     "VocabularyItemResponse",
+    "VocabularySearchResultResponse",
     "WordListResponse",
 ]
@@ -1,4 +1,6 @@
-from pydantic import BaseModel, Field
+from uuid import UUID
+
+from pydantic import BaseModel, Field, model_validator
 
 
 class UserProgressResponse(BaseModel):
@@ -17,10 +19,22 @@ class UserProgressResponse(BaseModel):
         populate_by_name = True
 
 
+class ProgressSyncResponse(BaseModel):
+    items: list[UserProgressResponse]
+    next_since: str = Field(alias="nextSince")
+    has_more: bool = Field(alias="hasMore")
+
+    class Config:
+        populate_by_name = True
+
+
 class ProgressUpdateRequest(BaseModel):
-    source_text: str = Field(alias="sourceText")
-    source_language: str = Field(alias="sourceLanguage")
-    target_language: str = Field(alias="targetLanguage")
+    """Progress for one word, addressed by vocabularyItemId or, for older clients, by its text key."""
+
+    vocabulary_item_id: UUID | None = Field(None, alias="vocabularyItemId")
+    source_text: str | None = Field(None, alias="sourceText")
+    source_language: str | None = Field(None, alias="sourceLanguage")
+    target_language: str | None = Field(None, alias="targetLanguage")
     level: int = Field(..., ge=0, le=5)
     queue_position: int = Field(alias="queuePosition", ge=0)
     correct_count: int = Field(alias="correctCount", ge=0)
@@ -29,3 +43,67 @@ class ProgressUpdateRequest(BaseModel):
 
     class Config:
         populate_by_name = True
+
+    @model_validator(mode="after")
+    def check_item_reference(self):
+        if self.vocabulary_item_id is None and None in (self.source_text, self.source_language, self.target_language):
+            raise ValueError("Either vocabularyItemId or sourceText, sourceLanguage and targetLanguage are required")
+        return self
+
+
+class ProgressBatchRequest(BaseModel):
+    items: list[ProgressUpdateRequest] = Field(..., min_length=1, max_length=1000)
+
+
+class ProgressBatchFailure(BaseModel):
+    index: int
+    vocabulary_item_id: str | None = Field(None, alias="vocabularyItemId")
+    source_text: str | None = Field(None, alias="sourceText")
+    error: str
+
+    class Config:
+        populate_by_name = True
+
+
+class ProgressBatchResponse(BaseModel):
+    saved: int
+    failed: list[ProgressBatchFailure]
+
+
+class PracticeItemResponse(BaseModel):
+    vocabulary_item_id: str = Field(alias="vocabularyItemId")
+    source_text: str = Field(alias="sourceText")
+    source_language: str = Field(alias="sourceLanguage")
+    target_text: str = Field(alias="targetText")
+    target_language: str = Field(alias="targetLanguage")
+    source_usage_example: str | None = Field(alias="sourceUsageExample")
+    target_usage_example: str | None = Field(alias="targetUsageExample")
+    level: int
+    queue_position: int | None = Field(alias="queuePosition")
+    consecutive_correct: int = Field(alias="consecutiveCorrect")
+    correct_count: int = Field(alias="correctCount")
+    incorrect_count: int = Field(alias="incorrectCount")
+
+    class Config:
+        populate_by_name = True
+
+
+class PracticeAnswerRequest(BaseModel):
+    vocabulary_item_id: UUID = Field(alias="vocabularyItemId")
+    is_correct: bool = Field(alias="isCorrect")
+
+    class Config:
+        populate_by_name = True
+
+
+class PracticeAnswerResponse(BaseModel):
+    vocabulary_item_id: str = Field(alias="vocabularyItemId")
+    previous_level: int = Field(alias="previousLevel")
+    level: int
+    queue_position: int = Field(alias="queuePosition")
+    consecutive_correct: int = Field(alias="consecutiveCorrect")
+    correct_count: int = Field(alias="correctCount")
+    incorrect_count: int = Field(alias="incorrectCount")
+
+    class Config:
+        populate_by_name = True
@@ -16,9 +16,30 @@ class TTSResponse(BaseModel):
         populate_by_name = True
 
 
+class TTSAudioResponse(BaseModel):
+    cache_key: str = Field(alias="cacheKey")
+    content_type: str = Field(alias="contentType", default="audio/mpeg")
+
+    class Config:
+        populate_by_name = True
+
+
 class TTSLanguagesResponse(BaseModel):
     available: bool
     supported_languages: list[str] = Field(alias="supportedLanguages")
 
     class Config:
         populate_by_name = True
+
+
+class TTSCacheStatsResponse(BaseModel):
+    memory_hits: int = Field(alias="memoryHits")
+    memory_misses: int = Field(alias="memoryMisses")
+    db_hits: int = Field(alias="dbHits")
+    db_misses: int = Field(alias="dbMisses")
+    memory_entries: int = Field(alias="memoryEntries")
+    memory_bytes: int = Field(alias="memoryBytes")
+    memory_max_bytes: int = Field(alias="memoryMaxBytes")
+
+    class Config:
+        populate_by_name = True
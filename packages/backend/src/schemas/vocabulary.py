@@ -15,6 +15,10 @@ class VocabularyItemResponse(BaseModel):
         populate_by_name = True
 
 
+class VocabularySearchResultResponse(VocabularyItemResponse):
+    score: float
+
+
 class WordListResponse(BaseModel):
     list_name: str = Field(alias="listName")
     word_count: int = Field(alias="wordCount")
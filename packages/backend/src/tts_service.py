@@ -1,19 +1,64 @@
+import asyncio
 import base64
+from collections import OrderedDict
 import hashlib
 import logging
 import os
+import time
 
+from core.config import (
+    TTS_ACCESS_FLUSH_INTERVAL_SECONDS,
+    TTS_CACHE_MAX_BYTES,
+    TTS_EVICTION_BATCH_SIZE,
+    TTS_EVICTION_INTERVAL_SECONDS,
+    TTS_MEMORY_CACHE_MAX_BYTES,
+)
+from core.database import async_execute_write_transaction, async_query_db
+from core.metrics import TTS_CACHE_REQUESTS, TTS_UPSTREAM_DURATION
 from google.cloud import texttospeech
 from google.oauth2 import service_account
-from psycopg2.extras import RealDictCursor
 
 logger = logging.getLogger(__name__)
 
 
+class AudioLRUCache:
+    """In-process LRU of audio clips bounded by total size in bytes rather than entry count."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> bytes | None:
+        audio = self._entries.get(key)
+        if audio is not None:
+            self._entries.move_to_end(key)
+        return audio
+
+    def put(self, key: str, audio: bytes):
+        if len(audio) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size_bytes -= len(previous)
+        self._entries[key] = audio
+        self.size_bytes += len(audio)
+        while self.size_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size_bytes -= len(evicted)
+
+
 class TTSService:
-    def __init__(self, db_pool):
+    def __init__(self):
         self.client = None
-        self.db_pool = db_pool
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.memory_cache = AudioLRUCache(TTS_MEMORY_CACHE_MAX_BYTES)
+        self.cache_stats = {"memory_hits": 0, "memory_misses": 0, "db_hits": 0, "db_misses": 0}
+        self._pending_access: dict[str, int] = {}
+        self._background_tasks: list[asyncio.Task] = []
         self.voice_configs = {
             "en": {"language_code": "en-US", "name": "en-US-Standard-A"},
             "de": {"language_code": "de-DE", "name": "de-DE-Standard-A"},
@@ -46,68 +91,153 @@ class TTSService:
     def get_cache_key(self, text: str, language: str) -> str:
         return hashlib.md5(f"{text}_{language}".encode()).hexdigest()
 
-    def _get_from_cache(self, text: str, language: str) -> bytes | None:
-        conn = None
+    async def _get_from_cache(self, cache_key: str) -> bytes | None:
+        audio = self.memory_cache.get(cache_key)
+        if audio is not None:
+            self.cache_stats["memory_hits"] += 1
+            TTS_CACHE_REQUESTS.labels("memory", "hit").inc()
+            self._record_access(cache_key)
+            return audio
+        self.cache_stats["memory_misses"] += 1
+        TTS_CACHE_REQUESTS.labels("memory", "miss").inc()
+
         try:
-            cache_key = self.get_cache_key(text, language)
-            conn = self.db_pool.getconn()
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(
-                    "SELECT audio_data FROM tts_cache WHERE cache_key = %s",
-                    (cache_key,),
-                )
-                result = cur.fetchone()
-
-                if result:
-                    return bytes(result["audio_data"])
+            result = await async_query_db(
+                "SELECT audio_data FROM tts_cache WHERE cache_key = %s",
+                (cache_key,),
+                one=True,
+            )
+            if result:
+                self.cache_stats["db_hits"] += 1
+                TTS_CACHE_REQUESTS.labels("db", "hit").inc()
+                audio = bytes(result["audio_data"])
+                self.memory_cache.put(cache_key, audio)
+                self._record_access(cache_key)
+                return audio
+            self.cache_stats["db_misses"] += 1
+            TTS_CACHE_REQUESTS.labels("db", "miss").inc()
 
         except Exception as e:
             logger.error(f"Cache read error: {e}")
-        finally:
-            if conn:
-                self.db_pool.putconn(conn)
         return None
 
-    def _save_to_cache(self, text: str, language: str, audio_content: bytes) -> bool:
-        conn = None
+    def _record_access(self, cache_key: str):
+        # Written to tts_cache in batches by the flush task, never on the request path.
+        self._pending_access[cache_key] = self._pending_access.get(cache_key, 0) + 1
+
+    async def flush_access_stats(self):
+        if not self._pending_access:
+            return
+        pending, self._pending_access = self._pending_access, {}
         try:
-            cache_key = self.get_cache_key(text, language)
-            conn = self.db_pool.getconn()
-            with conn.cursor() as cur:
-                cur.execute(
-                    """INSERT INTO tts_cache (cache_key, text, language, audio_data)
-                       VALUES (%s, %s, %s, %s)
-                       ON CONFLICT (cache_key)
-                       DO UPDATE SET audio_data = EXCLUDED.audio_data,
-                                     created_at = CURRENT_TIMESTAMP,
-                                     last_accessed_at = CURRENT_TIMESTAMP""",
-                    (cache_key, text, language, audio_content),
-                )
-                conn.commit()
-                return True
+            await async_execute_write_transaction(
+                """UPDATE tts_cache AS t
+                   SET access_count = t.access_count + a.hits,
+                       last_accessed_at = NOW()
+                   FROM unnest(%s::text[], %s::int[]) AS a(cache_key, hits)
+                   WHERE t.cache_key = a.cache_key""",
+                (list(pending.keys()), list(pending.values())),
+            )
+        except Exception as e:
+            logger.error(f"Failed to flush TTS cache access stats: {e}")
+            for cache_key, hits in pending.items():
+                self._pending_access[cache_key] = self._pending_access.get(cache_key, 0) + hits
+
+    async def evict_db_cache(self) -> int:
+        """Delete least-recently-accessed rows until tts_cache fits in TTS_CACHE_MAX_BYTES.
 
+        Deletes at most TTS_EVICTION_BATCH_SIZE rows per call to keep each transaction short.
+        """
+        try:
+            deleted = await async_execute_write_transaction(
+                """WITH ranked AS (
+                       SELECT cache_key, last_accessed_at,
+                              SUM(octet_length(audio_data)) OVER (ORDER BY last_accessed_at DESC, cache_key) AS running_bytes
+                       FROM tts_cache
+                   )
+                   DELETE FROM tts_cache
+                   WHERE cache_key IN (
+                       SELECT cache_key FROM ranked
+                       WHERE running_bytes > %s
+                       ORDER BY last_accessed_at
+                       LIMIT %s
+                   )""",
+                (TTS_CACHE_MAX_BYTES, TTS_EVICTION_BATCH_SIZE),
+            )
+            if deleted:
+                logger.info(f"Evicted {deleted} entries from tts_cache")
+            return deleted
         except Exception as e:
-            logger.error(f"Cache save error: {e}")
-            if conn:
-                try:
-                    conn.rollback()
-                except Exception:
+            logger.error(f"TTS cache eviction failed: {e}")
+            return 0
+
+    async def _run_maintenance(self):
+        next_eviction = time.monotonic()
+        while True:
+            await asyncio.sleep(TTS_ACCESS_FLUSH_INTERVAL_SECONDS)
+            await self.flush_access_stats()
+            if time.monotonic() >= next_eviction:
+                # Stats are flushed first so eviction sees up-to-date access times.
+                while await self.evict_db_cache() >= TTS_EVICTION_BATCH_SIZE:
                     pass
-            return False
-        finally:
-            if conn:
-                self.db_pool.putconn(conn)
-        return False
+                next_eviction = time.monotonic() + TTS_EVICTION_INTERVAL_SECONDS
 
-    def synthesize_speech(self, text: str, language: str) -> bytes | None:
-        if not self.is_available() or not text.strip():
-            return None
+    def start_background_tasks(self):
+        if not self._background_tasks:
+            self._background_tasks.append(asyncio.create_task(self._run_maintenance()))
 
-        text = text.strip()
-        if len(text) > 500:
-            return None
+    async def stop_background_tasks(self):
+        for task in self._background_tasks:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._background_tasks = []
+        await self.flush_access_stats()
+
+    def get_cache_stats(self) -> dict:
+        return {
+            **self.cache_stats,
+            "memory_entries": len(self.memory_cache),
+            "memory_bytes": self.memory_cache.size_bytes,
+            "memory_max_bytes": self.memory_cache.max_bytes,
+        }
+
+    async def _save_to_cache(self, cache_key: str, text: str, language: str, audio_content: bytes) -> bool:
+        try:
+            await async_execute_write_transaction(
+                """INSERT INTO tts_cache (cache_key, text, language, audio_data)
+                   VALUES (%s, %s, %s, %s)
+                   ON CONFLICT (cache_key)
+                   DO UPDATE SET audio_data = EXCLUDED.audio_data,
+                                 created_at = CURRENT_TIMESTAMP,
+                                 last_accessed_at = CURRENT_TIMESTAMP""",
+                (cache_key, text, language, audio_content),
+            )
+            return True
 
-        audio_content = self._get_from_cache(text, language)
+        except Exception as e:
+            logger.error(f"Cache save error: {e}")
+            return False
+
+    def _synthesize_upstream(self, text: str, voice_config: dict) -> bytes:
+        response = self.client.synthesize_speech(
+            input=texttospeech.SynthesisInput(text=text),
+            voice=texttospeech.VoiceSelectionParams(
+                language_code=voice_config["language_code"],
+                name=voice_config["name"],
+            ),
+            audio_config=texttospeech.AudioConfig(
+                audio_encoding=texttospeech.AudioEncoding.MP3,
+                speaking_rate=0.9,
+                effects_profile_id=["telephony-class-application"],
+            ),
+        )
+        return response.audio_content
+
+    async def _load_or_synthesize(self, cache_key: str, text: str, language: str) -> bytes | None:
+        audio_content = await self._get_from_cache(cache_key)
         if audio_content:
             return audio_content
 
@@ -116,29 +246,57 @@ class TTSService:
             logger.error(f"Language '{language}' not supported for TTS")
             return None
 
+        started = time.perf_counter()
         try:
-            response = self.client.synthesize_speech(
-                input=texttospeech.SynthesisInput(text=text),
-                voice=texttospeech.VoiceSelectionParams(
-                    language_code=voice_config["language_code"],
-                    name=voice_config["name"],
-                ),
-                audio_config=texttospeech.AudioConfig(
-                    audio_encoding=texttospeech.AudioEncoding.MP3,
-                    speaking_rate=0.9,
-                    effects_profile_id=["telephony-class-application"],
-                ),
-            )
+            # The gRPC client call blocks, so keep it off the event loop.
+            audio_content = await asyncio.to_thread(self._synthesize_upstream, text, voice_config)
+        except Exception as e:
+            TTS_UPSTREAM_DURATION.labels("error").observe(time.perf_counter() - started)
+            logger.error(f"TTS synthesis failed for '{text}' in {language}: {e}")
+            return None
 
-            audio_content = response.audio_content
+        TTS_UPSTREAM_DURATION.labels("success").observe(time.perf_counter() - started)
 
-            self._save_to_cache(text, language, audio_content)
+        await self._save_to_cache(cache_key, text, language, audio_content)
+        self.memory_cache.put(cache_key, audio_content)
+        return audio_content
 
-            return audio_content
+    async def get_cached_audio(self, cache_key: str) -> bytes | None:
+        return await self._get_from_cache(cache_key)
 
-        except Exception as e:
-            logger.error(f"TTS synthesis failed for '{text}' in {language}: {e}")
+    async def synthesize_speech(self, text: str, language: str) -> bytes | None:
+        if not self.is_available() or not text.strip():
             return None
 
+        text = text.strip()
+        if len(text) > 500:
+            return None
+
+        # Single-flight: concurrent requests for the same (text, language) share one cache
+        # lookup and at most one upstream synthesis call.
+        cache_key = self.get_cache_key(text, language)
+        inflight = self._inflight.get(cache_key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._load_or_synthesize(cache_key, text, language))
+            self._inflight[cache_key] = inflight
+            inflight.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+
+        # Shielded so one client disconnecting does not cancel the work others are waiting on.
+        return await asyncio.shield(inflight)
+
     def get_supported_languages(self) -> list:
         return list(self.voice_configs.keys())
+
+
+_tts_service: TTSService | None = None
+
+
+def init_tts_service() -> TTSService:
+    global _tts_service
+    if _tts_service is None:
+        _tts_service = TTSService()
+    return _tts_service
+
+
+def get_tts_service() -> TTSService:
+    return init_tts_service()
@@ -1,3 +1,4 @@
 from .case_conversion import convert_keys_to_camel_case, snake_to_camel
+from .pagination import decode_cursor, encode_cursor
 
-__all__ = ["convert_keys_to_camel_case", "snake_to_camel"]
+__all__ = ["convert_keys_to_camel_case", "decode_cursor", "encode_cursor", "snake_to_camel"]
@@ -0,0 +1,19 @@
+import base64
+import json
+
+
+def encode_cursor(values: list) -> str:
+    payload = json.dumps(values, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, length: int) -> list:
+    """Decode a cursor produced by encode_cursor(). Raises ValueError if it is malformed."""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(payload)
+    except Exception as e:
+        raise ValueError("Malformed cursor") from e
+    if not isinstance(values, list) or len(values) != length:
+        raise ValueError("Malformed cursor")
+    return values
@@ -31,6 +31,17 @@ if [ -n "$UVICORN_WORKERS" ]; then
 else
   WORKERS=1
 fi
+
+if [ "${METRICS_ENABLED:-true}" = "true" ]; then
+  # Workers write their metrics here and metrics_exporter.py serves the merged view on the
+  # internal METRICS_PORT, so every scrape covers all workers.
+  export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus-multiproc}"
+  rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+  mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+  echo "Starting metrics exporter on port ${METRICS_PORT:-9100}..."
+  python metrics_exporter.py &
+fi
+
 echo "Starting uvicorn with $WORKERS workers..."
 
 exec uvicorn main:app --host 0.0.0.0 --port 9000 --workers $WORKERS --log-level info
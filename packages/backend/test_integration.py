@@ -1,15 +1,20 @@
 #!/usr/bin/env python3
 
+import base64
+import gzip
 import os
 import random
 import string
 import sys
+import time
 
 import requests
 
 API_URL = os.getenv("API_URL", "http://localhost:9000/api")
 TIMEOUT = 30
 SKIP_TTS_TESTS = os.getenv("SKIP_TTS_TESTS", "false").lower() == "true"
+# Connection string of the API's database. Admin tests need it to grant the test user admin rights.
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
 
 GREEN = "\033[92m"
 RED = "\033[91m"
@@ -50,6 +55,22 @@ class TestRunner:
         if not condition:
             raise AssertionError(msg or "Condition is false")
 
+    def db_query(self, query, args=()):
+        import psycopg
+
+        with psycopg.connect(TEST_DATABASE_URL, autocommit=True) as conn:
+            cur = conn.execute(query, args)
+            return cur.fetchall() if cur.description else []
+
+    def wait_for_status(self, url, expected, headers, timeout=5.0):
+        """GET url until it answers with the expected status, for changes applied asynchronously."""
+        deadline = time.monotonic() + timeout
+        while True:
+            r = requests.get(url, headers=headers, timeout=TIMEOUT)
+            if r.status_code == expected or time.monotonic() > deadline:
+                return r
+            time.sleep(0.1)
+
     def run_all(self):
         print(f"\n{YELLOW}Running Integration Tests{RESET}")
         print(f"API URL: {API_URL}\n")
@@ -68,9 +89,19 @@ class TestRunner:
 
         self.test("Get word lists (authenticated)", self.test_get_word_lists)
         self.test("Get translations from list", self.test_get_translations)
+        self.test("Revalidate translations with ETag", self.test_translations_etag)
+        self.test("Negotiate response compression", self.test_compression_negotiation)
+        self.test("Skip compression below threshold", self.test_compression_threshold)
+        self.test("Separate ETags per content-coding", self.test_etag_per_encoding)
+        self.test("Search vocabulary", self.test_search_vocabulary)
         self.test("Get user progress", self.test_get_user_progress)
+        self.test("Sync user progress changes", self.test_sync_user_progress)
         self.test("Update user progress", self.test_update_user_progress)
+        self.test("Batch update user progress", self.test_batch_update_user_progress)
+        self.test("Update user progress by vocabulary item id", self.test_update_user_progress_by_id)
+        self.test("Practice next items and answer", self.test_practice_next_and_answer)
         self.test("Access denied without token", self.test_unauthorized)
+        self.test("Reject a reused refresh token", self.test_refresh_token_reuse)
 
         if not SKIP_TTS_TESTS:
             self.test("Get TTS supported languages", self.test_tts_languages)
@@ -88,9 +119,17 @@ class TestRunner:
                 "TTS synthesis without authentication",
                 self.test_tts_synthesize_unauthorized,
             )
+            self.test("Download TTS audio and revalidate with ETag", self.test_tts_audio_download)
+            self.test("Download TTS audio byte ranges", self.test_tts_audio_ranges)
+            self.test("Handle unsatisfiable and ignored TTS audio ranges", self.test_tts_audio_invalid_ranges)
         else:
             print(f"{YELLOW}Skipping TTS tests (SKIP_TTS_TESTS=true){RESET}")
 
+        if TEST_DATABASE_URL:
+            self.run_database_tests()
+        else:
+            print(f"{YELLOW}Skipping admin and database tests (TEST_DATABASE_URL not set){RESET}")
+
         self.test("Delete test account", self.test_delete_account)
 
         print(f"\n{YELLOW}Test Summary:{RESET}")
@@ -101,6 +140,16 @@ class TestRunner:
 
         return self.failed == 0
 
+    def run_database_tests(self):
+        self.test("Reject a used refresh token after it is purged", self.test_refresh_token_purged)
+        self.test("Grant admin access", self.test_grant_admin)
+        self.test("Page through admin vocabulary", self.test_admin_vocabulary_pages)
+        self.test("Reject tampered admin vocabulary cursor", self.test_admin_vocabulary_bad_cursor)
+        if not SKIP_TTS_TESTS:
+            self.test("Serve repeated TTS requests from cache", self.test_tts_repeat_from_cache)
+            self.test("Serve cached TTS audio from memory", self.test_tts_memory_cache_tier)
+        self.test("Revoke admin access without waiting for the cache TTL", self.test_revoke_admin)
+
     def test_health(self):
         r = requests.get(f"{API_URL}/health", timeout=TIMEOUT)
         self.assert_equal(r.status_code, 200)
@@ -184,6 +233,85 @@ class TestRunner:
                 self.assert_in("sourceLanguage", first_word)
                 self.assert_in("targetLanguage", first_word)
 
+    def test_translations_etag(self):
+        headers = {"Authorization": f"Bearer {self.token}"}
+        r = requests.get(f"{API_URL}/word-lists", headers=headers, timeout=TIMEOUT)
+        list_name = r.json()[0]["listName"]
+        url = f"{API_URL}/translations?list_name={list_name}"
+        r = requests.get(url, headers=headers, timeout=TIMEOUT)
+        self.assert_equal(r.status_code, 200)
+        etag = r.headers.get("ETag")
+        self.assert_true(etag, "ETag header missing")
+        r = requests.get(url, headers={**headers, "If-None-Match": etag}, timeout=TIMEOUT)
+        self.assert_equal(r.status_code, 304)
+
+    def translations_url(self, headers):
+        r = requests.get(f"{API_URL}/word-lists", headers=headers, timeout=TIMEOUT)
+        return f"{API_URL}/translations?list_name={r.json()[0]['listName']}"
+
+    def get_raw(self, url, headers):
+        """GET without decoding, returning the response and its body as sent on the wire."""
+        r = requests.get(url, headers=headers, timeout=TIMEOUT, stream=True)
+        return r, r.raw.read()
+
+    def test_compression_negotiation(self):
+        headers = {"Authorization": f"Bearer {self.token}"}
+        url = self.translations_url(headers)
+        _, plain = self.get_raw(url, {**headers, "Accept-Encoding": "identity"})
+        cases = [
+            ("gzip, br", "br"),
+            ("gzip;q=1.0, br;q=0.5", "gzip"),
+            ("br;q=0, gzip;q=0.1", "gzip"),
+            ("identity;q=0, *", "br"),
+            ("*;q=0", None),
+            ("deflate", None),
+            ("identity", None),
+        ]
+        for accept_encoding, expected in cases:
+            r, body = self.get_raw(url, {**headers, "Accept-Encoding": accept_encoding})
+            self.assert_equal(r.status_code, 200, accept_encoding)
+            self.assert_equal(r.headers.get("Content-Encoding"), expected, f"Content-Encoding for {accept_encoding!r}")
+            self.assert_in("accept-encoding", r.headers.get("Vary", "").lower(), f"Vary for {accept_encoding!r}")
+            if expected == "gzip":
+                self.assert_equal(gzip.decompress(body), plain, "Decompressed body")
+            elif expected is None:
+                self.assert_equal(body, plain, "Identity body")
+
+    def test_compression_threshold(self):
+        r, body = self.get_raw(f"{API_URL}/version", {"Accept-Encoding": "br, gzip"})
+        self.assert_equal(r.status_code, 200)
+        self.assert_true(len(body) < 1024, "Response unexpectedly above the compression threshold")
+        self.assert_equal(r.headers.get("Content-Encoding"), None, "Content-Encoding")
+        self.assert_in("accept-encoding", r.headers.get("Vary", "").lower(), "Vary")
+
+    def test_etag_per_encoding(self):
+        headers = {"Authorization": f"Bearer {self.token}"}
+        url = self.translations_url(headers)
+        etags = {}
+        for accept_encoding in ("br", "gzip", "identity"):
+            r, _ = self.get_raw(url, {**headers, "Accept-Encoding": accept_encoding})
+            etags[accept_encoding] = r.headers.get("ETag")
+            self.assert_true(etags[accept_encoding], f"ETag missing for {accept_encoding}")
+        self.assert_equal(len(set(etags.values())), 3, f"ETags not distinct: {etags}")
+
+        for accept_encoding, etag in etags.items():
+            r, _ = self.get_raw(url, {**headers, "Accept-Encoding": accept_encoding, "If-None-Match": etag})
+            self.assert_equal(r.status_code, 304, f"Revalidate {accept_encoding}")
+            self.assert_in("accept-encoding", r.headers.get("Vary", "").lower(), "Vary on 304")
+
+        r, _ = self.get_raw(url, {**headers, "Accept-Encoding": "br", "If-None-Match": etags["gzip"]})
+        self.assert_equal(r.status_code, 200, "gzip ETag must not validate the br representation")
+
+    def test_search_vocabulary(self):
+        headers = {"Authorization": f"Bearer {self.token}"}
+        r = requests.get(f"{API_URL}/word-lists", headers=headers, timeout=TIMEOUT)
+        list_name = r.json()[0]["listName"]
+        r = requests.get(f"{API_URL}/translations?list_name={list_name}", headers=headers, timeout=TIMEOUT)
+        word = r.json()[0]["sourceText"]
+        r = requests.get(f"{API_URL}/vocabulary/search", params={"query": word}, headers=headers, timeout=TIMEOUT)
+        self.assert_equal(r.status_code, 200)
+        self.assert_in(word, [item["sourceText"] for item in r.json()])
+
     def test_get_user_progress(self):
         headers = {"Authorization": f"Bearer {self.token}"}
         r = requests.get(f"{API_URL}/user/progress", headers=headers, timeout=TIMEOUT)
@@ -191,6 +319,18 @@ class TestRunner:
         data = r.json()
         self.assert_true(isinstance(data, list))
 
+    def test_sync_user_progress(self):
+        headers = {"Authorization": f"Bearer {self.token}"}
+        r = requests.get(f"{API_URL}/user/progress", params={"since": "", "limit": 10}, headers=headers, timeout=TIMEOUT)
+        self.assert_equal(r.status_code, 200)
+        data = r.json()
+        self.assert_true(isinstance(data["items"], list))
+        self.assert_true(len(data["items"]) <= 10)
+        self.assert_in("nextSince", data)
+        self.assert_in("hasMore", data)
+        r = requests.get(f"{API_URL}/user/progress", params={"since": "not-a-cursor"}, headers=headers, timeout=TIMEOUT)
+        self.assert_equal(r.status_code, 400)
+
     def test_update_user_progress(self):
         headers = {"Authorization": f"Bearer {self.token}"}
         progress_data = {
@@ -205,10 +345,133 @@ class TestRunner:
         r = requests.post(f"{API_URL}/user/progress", json=progress_data, headers=headers, timeout=TIMEOUT)
         self.assert_equal(r.status_code, 200)
 
+    def test_batch_update_user_progress(self):
+        headers = {"Authorization": f"Bearer {self.token}"}
+        r = requests.get(f"{API_URL}/word-lists", headers=headers, timeout=TIMEOUT)
+        list_name = r.json()[0]["listName"]
+        r = requests.get(f"{API_URL}/translations?list_name={list_name}", headers=headers, timeout=TIMEOUT)
+        words = r.json()[:3]
+        items = [
+            {
+                "sourceText": word["sourceText"],
+                "sourceLanguage": word["sourceLanguage"],
+                "targetLanguage": word["targetLanguage"],
+                "level": 1,
+                "queuePosition": index,
+                "correctCount": 1,
+                "incorrectCount": 0,
+                "consecutiveCorrect": 1,
+            }
+            for index, word in enumerate(words)
+        ]
+        items.append({**items[0], "sourceText": "__missing_word__"})
+        r = requests.post(f"{API_URL}/user/progress/batch", json={"items": items}, headers=headers, timeout=TIMEOUT)
+        self.assert_equal(r.status_code, 200)
+        data = r.json()
+        self.assert_equal(data["saved"], len(words))
+        self.assert_equal(len(data["failed"]), 1)
+        self.assert_equal(data["failed"][0]["index"], len(words))
+
+    def test_update_user_progress_by_id(self):
+        headers = {"Authorization": f"Bearer {self.token}"}
+        r = requests.get(f"{API_URL}/word-lists", headers=headers, timeout=TIMEOUT)
+        list_name = r.json()[0]["listName"]
+        r = requests.get(f"{API_URL}/translations?list_name={list_name}", headers=headers, timeout=TIMEOUT)
+        word = r.json()[0]
+        progress_data = {
+            "vocabularyItemId": word["id"],
+            "level": 2,
+            "queuePosition": 4,
+            "correctCount": 3,
+            "incorrectCount": 0,
+            "consecutiveCorrect": 3,
+        }
+        r = requests.post(f"{API_URL}/user/progress", json=progress_data, headers=headers, timeout=TIMEOUT)
+        self.assert_equal(r.status_code, 200)
+        r = requests.get(f"{API_URL}/user/progress?list_name={list_name}", headers=headers, timeout=TIMEOUT)
+        saved = next(p for p in r.json() if p["vocabularyItemId"] == word["id"])
+        self.assert_equal(saved["level"], 2)
+
+        missing_id = "00000000-0000-0000-0000-000000000000"
+        r = requests.post(
+            f"{API_URL}/user/progress",
+            json={**progress_data, "vocabularyItemId": missing_id},
+            headers=headers,
+            timeout=TIMEOUT,
+        )
+        self.assert_equal(r.status_code, 404)
+        r = requests.post(
+            f"{API_URL}/user/progress/batch",
+            json={"items": [progress_data, {**progress_data, "vocabularyItemId": missing_id}]},
+            headers=headers,
+            timeout=TIMEOUT,
+        )
+        self.assert_equal(r.json()["saved"], 1)
+        self.assert_equal(r.json()["failed"][0]["vocabularyItemId"], missing_id)
+
+        without_reference = {key: value for key, value in progress_data.items() if key != "vocabularyItemId"}
+        r = requests.post(f"{API_URL}/user/progress", json=without_reference, headers=headers, timeout=TIMEOUT)
+        self.assert_equal(r.status_code, 422)
+
+    def test_practice_next_and_answer(self):
+        headers = {"Authorization": f"Bearer {self.token}"}
+        r = requests.get(f"{API_URL}/word-lists", headers=headers, timeout=TIMEOUT)
+        list_name = r.json()[0]["listName"]
+        r = requests.get(f"{API_URL}/user/practice/next?list_name={list_name}&limit=5", headers=headers, timeout=TIMEOUT)
+        self.assert_equal(r.status_code, 200)
+        items = r.json()
+        self.assert_true(0 < len(items) <= 5)
+        item_id = items[0]["vocabularyItemId"]
+        for _ in range(3):
+            r = requests.post(
+                f"{API_URL}/user/practice/answer",
+                json={"vocabularyItemId": item_id, "isCorrect": True},
+                headers=headers,
+                timeout=TIMEOUT,
+            )
+            self.assert_equal(r.status_code, 200)
+            data = r.json()
+            if data["level"] != data["previousLevel"]:
+                break
+        self.assert_equal(data["level"], data["previousLevel"] + 1)
+        self.assert_equal(data["consecutiveCorrect"], 0)
+
     def test_unauthorized(self):
         r = requests.get(f"{API_URL}/word-lists", timeout=TIMEOUT)
         self.assert_equal(r.status_code, 403)
 
+    def refresh(self, refresh_token):
+        return requests.post(f"{API_URL}/auth/refresh", json={"refresh_token": refresh_token}, timeout=TIMEOUT)
+
+    def login_refresh_token(self):
+        r = requests.post(f"{API_URL}/auth/login", json=self.test_user, timeout=TIMEOUT)
+        self.assert_equal(r.status_code, 200, "Login")
+        return r.json()["refresh_token"]
+
+    def test_refresh_token_reuse(self):
+        used = self.login_refresh_token()
+        r = self.refresh(used)
+        self.assert_equal(r.status_code, 200, "First refresh")
+        rotated = r.json()["refresh_token"]
+        self.assert_true(rotated != used, "Refresh token was not rotated")
+        # The second rejection is answered from the rejected-token cache rather than the table.
+        for attempt in ("Reuse", "Second reuse"):
+            self.assert_equal(self.refresh(used).status_code, 401, attempt)
+        self.assert_equal(self.refresh(rotated).status_code, 200, "Rotated token")
+
+    def test_refresh_token_purged(self):
+        used = self.login_refresh_token()
+        self.assert_equal(self.refresh(used).status_code, 200, "First refresh")
+        # Delete the user's revoked rows, as the cleanup job does once their retention has passed.
+        purged = self.db_query(
+            """DELETE FROM refresh_tokens
+               WHERE revoked_at IS NOT NULL AND user_id = (SELECT id FROM users WHERE username = %s)
+               RETURNING id""",
+            (self.test_user["username"],),
+        )
+        self.assert_true(purged, "No revoked refresh tokens to purge")
+        self.assert_equal(self.refresh(used).status_code, 401, "Reuse after purge")
+
     def test_delete_account(self):
         headers = {"Authorization": f"Bearer {self.token}"}
         r = requests.delete(f"{API_URL}/auth/delete-account", headers=headers, timeout=TIMEOUT)
@@ -258,6 +521,157 @@ class TestRunner:
         r = requests.post(f"{API_URL}/tts/synthesize", json=tts_data, timeout=TIMEOUT)
         self.assert_equal(r.status_code, 403)
 
+    def tts_audio_url(self, text="hello"):
+        headers = {"Authorization": f"Bearer {self.token}"}
+        tts_data = {"text": text, "language": "en"}
+        r = requests.post(f"{API_URL}/tts/audio", json=tts_data, headers=headers, timeout=TIMEOUT)
+        self.assert_equal(r.status_code, 200, "Prepare audio")
+        return f"{API_URL}/tts/audio/{r.json()['cacheKey']}"
+
+    def test_tts_audio_download(self):
+        url = self.tts_audio_url()
+        r = requests.get(url, timeout=TIMEOUT)
+        self.assert_equal(r.status_code, 200)
+        self.assert_equal(r.headers.get("Content-Type"), "audio/mpeg", "Content-Type")
+        self.assert_equal(r.headers.get("Accept-Ranges"), "bytes", "Accept-Ranges")
+        self.assert_true(r.content, "Audio body is empty")
+        etag = r.headers.get("ETag")
+        self.assert_true(etag, "ETag header missing")
+        r = requests.get(url, headers={"If-None-Match": etag}, timeout=TIMEOUT)
+        self.assert_equal(r.status_code, 304)
+        self.assert_equal(r.content, b"", "304 body")
+
+    def test_tts_audio_ranges(self):
+        url = self.tts_audio_url()
+        audio = requests.get(url, timeout=TIMEOUT).content
+        size = len(audio)
+
+        r = requests.get(url, headers={"Range": "bytes=0-1"}, timeout=TIMEOUT)
+        self.assert_equal(r.status_code, 206)
+        self.assert_equal(r.headers.get("Content-Range"), f"bytes 0-1/{size}", "Content-Range")
+        self.assert_equal(r.content, audio[:2], "Range body")
+
+        r = requests.get(url, headers={"Range": "bytes=-3"}, timeout=TIMEOUT)
+        self.assert_equal(r.status_code, 206)
+        self.assert_equal(r.headers.get("Content-Range"), f"bytes {size - 3}-{size - 1}/{size}", "Suffix Content-Range")
+        self.assert_equal(r.content, audio[-3:], "Suffix range body")
+
+        etag = requests.get(url, timeout=TIMEOUT).headers["ETag"]
+        r = requests.get(url, headers={"Range": "bytes=2-", "If-Range": etag}, timeout=TIMEOUT)
+        self.assert_equal(r.status_code, 206)
+        self.assert_equal(r.content, audio[2:], "Open-ended range body")
+
+    def test_tts_audio_invalid_ranges(self):
+        url = self.tts_audio_url()
+        audio = requests.get(url, timeout=TIMEOUT).content
+        size = len(audio)
+
+        r = requests.get(url, headers={"Range": f"bytes={size}-"}, timeout=TIMEOUT)
+        self.assert_equal(r.status_code, 416)
+        self.assert_equal(r.headers.get("Content-Range"), f"bytes */{size}", "Content-Range")
+
+        r = requests.get(url, headers={"Range": "bytes=abc"}, timeout=TIMEOUT)
+        self.assert_equal(r.status_code, 200, "Malformed range")
+        self.assert_equal(r.content, audio, "Malformed range body")
+
+        r = requests.get(url, headers={"Range": "bytes=0-1", "If-Range": '"stale"'}, timeout=TIMEOUT)
+        self.assert_equal(r.status_code, 200, "Stale If-Range")
+        self.assert_equal(r.content, audio, "Stale If-Range body")
+
+    def test_grant_admin(self):
+        headers = {"Authorization": f"Bearer {self.token}"}
+        url = f"{API_URL}/admin/vocabulary?limit=1"
+        r = requests.get(url, headers=headers, timeout=TIMEOUT)
+        self.assert_equal(r.status_code, 403, "Before promotion")
+        self.db_query("UPDATE users SET is_admin = TRUE WHERE username = %s", (self.test_user["username"],))
+        r = self.wait_for_status(url, 200, headers)
+        self.assert_equal(r.status_code, 200, "After promotion")
+
+    def test_revoke_admin(self):
+        headers = {"Authorization": f"Bearer {self.token}"}
+        url = f"{API_URL}/admin/vocabulary?limit=1"
+        # Warm the user cache with the admin row first.
+        self.assert_equal(requests.get(url, headers=headers, timeout=TIMEOUT).status_code, 200, "Before demotion")
+        self.db_query("UPDATE users SET is_admin = FALSE WHERE username = %s", (self.test_user["username"],))
+        # Far below USER_CACHE_TTL_SECONDS: only the change notification can make this pass.
+        r = self.wait_for_status(url, 403, headers, timeout=2.0)
+        self.assert_equal(r.status_code, 403, "After demotion")
+
+    def test_admin_vocabulary_pages(self):
+        headers = {"Authorization": f"Bearer {self.token}"}
+        list_name = requests.get(f"{API_URL}/word-lists", headers=headers, timeout=TIMEOUT).json()[0]["listName"]
+        expected = [
+            row[0]
+            for row in self.db_query(
+                """SELECT id::text FROM vocabulary_items
+                   WHERE version_id = (SELECT id FROM content_versions WHERE is_active) AND list_name = %s
+                   ORDER BY list_name, source_text, id""",
+                (list_name,),
+            )
+        ]
+        self.assert_true(len(expected) > 50, "List too small to span several pages")
+
+        seen = []
+        cursor = None
+        pages = 0
+        while True:
+            params = {"list_name": list_name, "limit": 50}
+            if cursor:
+                params["cursor"] = cursor
+            r = requests.get(f"{API_URL}/admin/vocabulary", params=params, headers=headers, timeout=TIMEOUT)
+            self.assert_equal(r.status_code, 200)
+            data = r.json()
+            seen.extend(item["id"] for item in data["items"])
+            pages += 1
+            cursor = data["nextCursor"]
+            if cursor is None:
+                break
+            self.assert_equal(len(data["items"]), 50, "Page size before the last page")
+
+        self.assert_equal(pages, (len(expected) + 49) // 50, "Page count")
+        self.assert_equal(len(seen), len(set(seen)), "Duplicate items across pages")
+        self.assert_equal(seen, expected, "Items across pages")
+
+    def test_admin_vocabulary_bad_cursor(self):
+        headers = {"Authorization": f"Bearer {self.token}"}
+        r = requests.get(f"{API_URL}/admin/vocabulary", params={"limit": 1}, headers=headers, timeout=TIMEOUT)
+        cursor = r.json()["nextCursor"]
+        self.assert_true(cursor, "nextCursor missing")
+        forged = base64.urlsafe_b64encode(b'["x","y","not-a-uuid"]').decode().rstrip("=")
+        for bad_cursor in (cursor[:-3], forged, "!!!"):
+            r = requests.get(f"{API_URL}/admin/vocabulary", params={"cursor": bad_cursor}, headers=headers, timeout=TIMEOUT)
+            self.assert_equal(r.status_code, 400, f"Cursor {bad_cursor!r}")
+
+    def tts_cache_stats(self):
+        # Per-worker counters: exact with a single API worker, as in docker-compose.test.yml.
+        headers = {"Authorization": f"Bearer {self.token}"}
+        r = requests.get(f"{API_URL}/admin/tts/cache-stats", headers=headers, timeout=TIMEOUT)
+        self.assert_equal(r.status_code, 200, "Cache stats")
+        return r.json()
+
+    def test_tts_repeat_from_cache(self):
+        self.tts_audio_url("cache check")
+        before = self.tts_cache_stats()
+        self.tts_audio_url("cache check")
+        after = self.tts_cache_stats()
+        self.assert_equal(
+            after["memoryHits"] + after["dbHits"],
+            before["memoryHits"] + before["dbHits"] + 1,
+            "Cache hits after a repeated request",
+        )
+        self.assert_equal(after["dbMisses"], before["dbMisses"], "A repeated request must not miss the cache")
+
+    def test_tts_memory_cache_tier(self):
+        url = self.tts_audio_url("cache check")
+        before = self.tts_cache_stats()
+        r = requests.get(url, timeout=TIMEOUT)
+        self.assert_equal(r.status_code, 200)
+        after = self.tts_cache_stats()
+        self.assert_equal(after["memoryHits"], before["memoryHits"] + 1, "Memory hits")
+        self.assert_equal(after["dbHits"] + after["dbMisses"], before["dbHits"] + before["dbMisses"], "Database lookups")
+        self.assert_true(after["memoryEntries"] >= 1, "Memory tier is empty")
+        self.assert_true(len(r.content) <= after["memoryBytes"] <= after["memoryMaxBytes"], "Memory tier byte accounting")
+
 
 def main():
     runner = TestRunner()
@@ -1,4 +1,4 @@
-import type { VocabularyItem } from './api-types';
+import type { VocabularyItem, VocabularyPage } from './api-types';
 
 declare global {
   interface Window {
@@ -126,14 +126,14 @@ const adminApi = {
 
   listVocabulary: async (
     token: string,
-    options: { listName?: string; limit?: number; offset?: number } = {},
-  ): Promise<VocabularyItem[]> => {
+    options: { listName?: string; limit?: number; cursor?: string } = {},
+  ): Promise<VocabularyPage> => {
     const params = new URLSearchParams();
     if (options.listName) params.append('list_name', options.listName);
     if (options.limit) params.append('limit', options.limit.toString());
-    if (options.offset) params.append('offset', options.offset.toString());
+    if (options.cursor) params.append('cursor', options.cursor);
 
-    return fetchWrapper<VocabularyItem[]>(`${serverAddress}/admin/vocabulary?${params.toString()}`, {
+    return fetchWrapper<VocabularyPage>(`${serverAddress}/admin/vocabulary?${params.toString()}`, {
       headers: {
         Authorization: `Bearer ${token}`,
       },
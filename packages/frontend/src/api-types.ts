@@ -19,6 +19,7 @@ export interface WordList {
 }
 
 export interface Translation {
+  id: string;
   sourceText: string;
   sourceLanguage: string;
   targetText: string;
@@ -41,6 +42,33 @@ export interface UserProgress {
   lastPracticed?: string;
 }
 
+export interface ProgressSyncResponse {
+  items: UserProgress[];
+  nextSince: string;
+  hasMore: boolean;
+}
+
+export interface ProgressUpdate {
+  vocabularyItemId: string;
+  level: number;
+  queuePosition: number;
+  correctCount: number;
+  incorrectCount: number;
+  consecutiveCorrect: number;
+}
+
+export interface ProgressBatchFailure {
+  index: number;
+  vocabularyItemId?: string;
+  sourceText?: string;
+  error: string;
+}
+
+export interface ProgressBatchResponse {
+  saved: number;
+  failed: ProgressBatchFailure[];
+}
+
 export interface VocabularyItem {
   id: string;
   sourceText: string;
@@ -55,6 +83,12 @@ export interface VocabularyItem {
   updatedAt?: string;
 }
 
+export interface VocabularyPage {
+  items: VocabularyItem[];
+  nextCursor: string | null;
+  estimatedTotal: number;
+}
+
 export interface TTSResponse {
   audioData: string;
   contentType: string;
@@ -62,6 +96,11 @@ export interface TTSResponse {
   language: string;
 }
 
+export interface TTSAudioResponse {
+  cacheKey: string;
+  contentType: string;
+}
+
 export interface TTSLanguagesResponse {
   available: boolean;
   supportedLanguages: string[];
@@ -22,8 +22,12 @@ import type {
   Translation,
   UserProgress,
   TTSResponse,
+  TTSAudioResponse,
   TTSLanguagesResponse,
   ContentVersion,
+  ProgressUpdate,
+  ProgressBatchResponse,
+  ProgressSyncResponse,
 } from './api-types';
 
 const serverAddress = getServerAddress();
@@ -118,22 +122,17 @@ const api = {
 
   fetchWordLists: createApiMethod<WordList[]>('/word-lists'),
 
-  saveProgress: createApiMethod<
-    void,
-    {
-      sourceText: string;
-      sourceLanguage: string;
-      targetLanguage: string;
-      level: number;
-      queuePosition: number;
-      correctCount: number;
-      incorrectCount: number;
-    }
-  >('/user/progress', 'POST'),
+  saveProgress: createApiMethod<void, ProgressUpdate>('/user/progress', 'POST'),
+  saveProgressBatch: createApiMethod<ProgressBatchResponse, { items: ProgressUpdate[] }>('/user/progress/batch', 'POST'),
 
   synthesizeSpeech: createApiMethod<TTSResponse, { text: string; language: string }>('/tts/synthesize', 'POST'),
+  prepareSpeech: createApiMethod<TTSAudioResponse, { text: string; language: string }>('/tts/audio', 'POST'),
   getTTSLanguages: createApiMethod<TTSLanguagesResponse>('/tts/languages'),
 
+  ttsAudioUrl(cacheKey: string): string {
+    return `${serverAddress}/tts/audio/${encodeURIComponent(cacheKey)}`;
+  },
+
   deleteAccount: createApiMethod<void>('/auth/delete-account', 'DELETE'),
 
   async fetchTranslations(token: string, listName: string): Promise<Translation[]> {
@@ -150,6 +149,12 @@ const api = {
     return fetchWrapper(url, withAuth(token, { method: 'GET' }));
   },
 
+  async fetchProgressChanges(token: string, since: string, listName?: string): Promise<ProgressSyncResponse> {
+    const params = new URLSearchParams({ since });
+    if (listName) params.set('list_name', listName);
+    return fetchWrapper(`${serverAddress}/user/progress?${params}`, withAuth(token, { method: 'GET' }));
+  },
+
   async fetchContentVersion(token: string): Promise<ContentVersion> {
     return fetchWrapper(`${serverAddress}/content-version`, withAuth(token, { method: 'GET' }));
   },
@@ -61,23 +61,19 @@ export class TTSService {
     this.updateState({ isPlaying: true });
 
     try {
-      const ttsData = await api.synthesizeSpeech(token, text, language);
-      const audioBlob = new Blob([Uint8Array.from(atob(ttsData.audioData), (c) => c.charCodeAt(0))], {
-        type: 'audio/mpeg',
-      });
-      const audioUrl = URL.createObjectURL(audioBlob);
+      const { cacheKey } = await api.prepareSpeech(token, { text, language });
 
-      this.currentAudio = new Audio(audioUrl);
+      // The audio endpoint serves immutable, content-addressed MP3 bytes, so the browser
+      // can stream and cache it directly instead of decoding base64 from JSON.
+      this.currentAudio = new Audio(api.ttsAudioUrl(cacheKey));
 
       this.currentAudio.onended = (): void => {
         this.updateState({ isPlaying: false });
-        URL.revokeObjectURL(audioUrl);
         this.currentAudio = null;
       };
 
       this.currentAudio.onerror = (): void => {
         this.updateState({ isPlaying: false });
-        URL.revokeObjectURL(audioUrl);
         this.currentAudio = null;
       };
 
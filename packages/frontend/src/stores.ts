@@ -2,7 +2,7 @@ import { writable, get, derived, type Writable } from 'svelte/store';
 import { jwtDecode } from 'jwt-decode';
 import api from './api';
 import { QuizManager, type QuizQuestion, type SubmissionResult } from '@lingua-quiz/core';
-import type { WordList, LevelWordLists, TranslationDisplay, AuthResponse } from './api-types';
+import type { WordList, LevelWordLists, TranslationDisplay, AuthResponse, ProgressSyncResponse } from './api-types';
 import { STORAGE_KEYS, THEMES } from './lib/constants';
 import { LEVEL_CONFIG } from './lib/config/levelConfig';
 
@@ -269,6 +269,14 @@ interface QuizState {
   error: string | null;
 }
 
+interface ProgressCounts {
+  level: number;
+  queuePosition: number;
+  correctCount: number;
+  incorrectCount: number;
+  consecutiveCorrect: number;
+}
+
 interface QuizStore {
   subscribe: Writable<QuizState>['subscribe'];
   loadWordLists: (token: string) => Promise<void>;
@@ -296,10 +304,41 @@ function createQuizStore(): QuizStore {
   const DEBOUNCE_DELAY = 1000;
   let debounceTimer: NodeJS.Timeout | null = null;
 
-  const progressMap = new Map<
-    string,
-    { level: number; queuePosition: number; correctCount: number; incorrectCount: number; targetLanguage: string }
-  >();
+  // Pending progress keyed by vocabulary item id, so saves address words by primary key.
+  const progressMap = new Map<string, ProgressCounts>();
+  // QuizManager translation ids are positions in the current list; map them back to vocabulary item ids.
+  const vocabularyItemIds = new Map<number, string>();
+  // Progress already fetched per word list, with the delta-sync watermark to resume from, so
+  // reopening a list only downloads rows changed since the last visit.
+  const syncedProgress = new Map<string, { nextSince: string; items: Map<string, ProgressCounts> }>();
+
+  let progressOwner: string | null = null;
+  authStore.subscribe(({ username }) => {
+    if (username !== progressOwner) {
+      syncedProgress.clear();
+      progressOwner = username;
+    }
+  });
+
+  const syncListProgress = async (token: string, listName: string): Promise<Map<string, ProgressCounts>> => {
+    const synced = syncedProgress.get(listName) ?? { nextSince: '', items: new Map<string, ProgressCounts>() };
+    let page: ProgressSyncResponse;
+    do {
+      page = await api.fetchProgressChanges(token, synced.nextSince, listName);
+      for (const p of page.items) {
+        synced.items.set(p.vocabularyItemId, {
+          level: p.level,
+          queuePosition: p.queuePosition,
+          correctCount: p.correctCount,
+          incorrectCount: p.incorrectCount,
+          consecutiveCorrect: p.consecutiveCorrect,
+        });
+      }
+      synced.nextSince = page.nextSince;
+    } while (page.hasMore);
+    syncedProgress.set(listName, synced);
+    return synced.items;
+  };
 
   const bulkSaveProgress = async (token: string): Promise<void> => {
     const state = get(store);
@@ -311,32 +350,30 @@ function createQuizStore(): QuizStore {
     }
 
     try {
-      const persistencePromises: Promise<void>[] = [];
-
-      for (const [key, progress] of progressMap.entries()) {
-        const [sourceText, sourceLanguage] = key.split('::');
-        persistencePromises.push(
-          api
-            .saveProgress(token, {
-              sourceText,
-              sourceLanguage,
-              targetLanguage: progress.targetLanguage,
-              level: progress.level,
-              queuePosition: progress.queuePosition,
-              correctCount: progress.correctCount,
-              incorrectCount: progress.incorrectCount,
-            })
-            .catch((err) => {
-              console.error(`Progress save failed for ${sourceText}:`, err);
-              return Promise.resolve();
-            }),
-        );
+      const items = Array.from(progressMap.entries()).map(([vocabularyItemId, progress]) => ({
+        vocabularyItemId,
+        level: progress.level,
+        queuePosition: progress.queuePosition,
+        correctCount: progress.correctCount,
+        incorrectCount: progress.incorrectCount,
+        consecutiveCorrect: progress.consecutiveCorrect,
+      }));
+
+      const result = await api.saveProgressBatch(token, { items });
+      const failedIds = new Set<string>();
+      for (const failure of result.failed) {
+        console.error(`Progress save failed for ${failure.vocabularyItemId ?? failure.sourceText}: ${failure.error}`);
+        if (failure.vocabularyItemId) failedIds.add(failure.vocabularyItemId);
       }
-
-      if (persistencePromises.length > 0) {
-        await Promise.allSettled(persistencePromises);
-        progressMap.clear();
+      // The server only reports a row to delta sync once it has settled, so keep our own saves
+      // in the synced copy of this list rather than waiting for them to come back.
+      const synced = state.selectedQuiz ? syncedProgress.get(state.selectedQuiz) : undefined;
+      if (synced) {
+        for (const { vocabularyItemId, ...progress } of items) {
+          if (!failedIds.has(vocabularyItemId)) synced.items.set(vocabularyItemId, progress);
+        }
       }
+      progressMap.clear();
     } catch (error) {
       const errorInfo = handleQuiz401Error(error);
       if (!errorInfo.isUnauthorized) {
@@ -401,6 +438,7 @@ function createQuizStore(): QuizStore {
 
       if (versionChanged) {
         progressMap.clear();
+        syncedProgress.clear();
       }
 
       const result = await withAuth401Handling(
@@ -418,25 +456,13 @@ function createQuizStore(): QuizStore {
 
       const result = await withAuth401Handling(
         async () => {
-          const [translations, userProgress] = await Promise.all([
+          const [translations, progressLookup] = await Promise.all([
             api.fetchTranslations(token, quizName),
-            api.fetchUserProgress(token, quizName),
+            syncListProgress(token, quizName),
           ]);
 
-          const progressLookup = new Map(
-            userProgress.map((p) => [
-              `${p.sourceText}::${p.sourceLanguage}::${p.targetLanguage}`,
-              {
-                level: p.level,
-                queuePosition: p.queuePosition,
-                correctCount: p.correctCount,
-                incorrectCount: p.incorrectCount,
-              },
-            ]),
-          );
-
           // Check if user has any saved progress with initialized queue positions
-          const hasInitializedProgress = userProgress.some((p) => p.queuePosition > 0);
+          const hasInitializedProgress = Array.from(progressLookup.values()).some((p) => p.queuePosition > 0);
 
           // Shuffle translations only for new users (no saved progress)
           let orderedTranslations = translations;
@@ -455,8 +481,7 @@ function createQuizStore(): QuizStore {
           }));
 
           const progress = orderedTranslations.map((word, index) => {
-            const key = `${word.sourceText}::${word.sourceLanguage}::${word.targetLanguage}`;
-            const userProg = progressLookup.get(key);
+            const userProg = progressLookup.get(word.id);
             const level = userProg?.level ?? 0;
             const queuePosition = userProg?.queuePosition ?? index;
 
@@ -470,20 +495,14 @@ function createQuizStore(): QuizStore {
           });
 
           progressMap.clear();
+          vocabularyItemIds.clear();
+          orderedTranslations.forEach((word, index) => vocabularyItemIds.set(index + 1, word.id));
 
           // Initialize progressMap with persisted counts from database
-          for (const [key, prog] of progressLookup.entries()) {
-            const translation = orderedTranslations.find(
-              (t) => `${t.sourceText}::${t.sourceLanguage}::${t.targetLanguage}` === key,
-            );
-            if (translation) {
-              progressMap.set(key, {
-                level: prog.level,
-                queuePosition: prog.queuePosition,
-                correctCount: prog.correctCount,
-                incorrectCount: prog.incorrectCount,
-                targetLanguage: translation.targetLanguage,
-              });
+          for (const word of orderedTranslations) {
+            const prog = progressLookup.get(word.id);
+            if (prog) {
+              progressMap.set(word.id, { ...prog });
             }
           }
 
@@ -531,13 +550,12 @@ function createQuizStore(): QuizStore {
         const feedback = state.quizManager.submitAnswer(state.currentQuestion.translationId, answer);
 
         const { translationId } = state.currentQuestion;
-        const translation = state.quizManager.getTranslation(translationId);
-        if (!translation) {
-          console.error(`Translation not found for ID ${translationId}`);
+        const vocabularyItemId = vocabularyItemIds.get(translationId);
+        if (!vocabularyItemId) {
+          console.error(`Vocabulary item not found for translation ID ${translationId}`);
           return feedback;
         }
 
-        const key = `${translation.sourceText}::${translation.sourceLanguage}::${translation.targetLanguage}`;
         const quizState = state.quizManager.getState();
         const currentProgress = quizState.progress.find((p) => p.translationId === translationId);
 
@@ -547,20 +565,20 @@ function createQuizStore(): QuizStore {
         }
 
         const level = parseInt(currentProgress.level.replace('LEVEL_', ''));
-        const existing = progressMap.get(key) ?? {
+        const existing = progressMap.get(vocabularyItemId) ?? {
           correctCount: 0,
           incorrectCount: 0,
+          consecutiveCorrect: 0,
           level: 0,
           queuePosition: 0,
-          targetLanguage: translation.targetLanguage,
         };
 
-        progressMap.set(key, {
+        progressMap.set(vocabularyItemId, {
           level,
           queuePosition: currentProgress.queuePosition,
           correctCount: existing.correctCount + (feedback.isSuccess ? 1 : 0),
           incorrectCount: existing.incorrectCount + (feedback.isSuccess ? 0 : 1),
-          targetLanguage: translation.targetLanguage,
+          consecutiveCorrect: currentProgress.consecutiveCorrect,
         });
 
         debouncedBulkSave(token);